@@ -1,5 +1,10 @@
-import tkinter as tk
-from src.ui import Window
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from src.cli import main
+        sys.exit(main(sys.argv[1:]))
+    
+    import tkinter as tk
+    from src.ui import Window
     Window(tk.Tk()).root.mainloop()
\ No newline at end of file
@@ -0,0 +1,280 @@
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bench.generate import make_lines
+from bench.server import StubServer, game_data, local_api
+from src.cache import game_maps
+from src.dedupe import Ledger, fingerprint
+from src.games import Game
+from src.importer import Importer, check_lines, parse_line
+from src.pool import AccountPool
+from src.replay import ReplayClient
+from src.session import Session
+from src.store import QueueStore
+from src.submitter import Submitter
+from src.utils import parse_time
+from src.validation import validate_rows
+from src.videos import OK, VideoChecker
+
+SUITES = ('parse', 'validate', 'import', 'submit', 'videos', 'startup')
+STARTUP_MODULES = ('src.ui', 'src.cli')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# counts and wall time are informational, only rates, latencies and memory are held to the baseline
+COMPARED = ('_per_s', '_ms', '_mb')
+
+def _measure(fn: Callable[[], Any], memory: bool) -> Tuple[float, Optional[float], Any]:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    if not memory:
+        return elapsed, None, result
+    
+    # second pass, since tracemalloc slows allocation-heavy code down several times over
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, result
+
+def _metrics(count: int, elapsed: float, peak: Optional[float], unit: str = 'lines', **extra) -> Dict[str, float]:
+    metrics = {f"{unit}_per_s": count / elapsed, 'seconds': elapsed, **extra}
+    if peak is not None:
+        metrics['peak_mb'] = peak
+    return metrics
+
+def _game() -> Game:
+    return Game("bench", game_maps(game_data("bench")))
+
+def bench_parse(lines: List[str], memory: bool) -> Dict[str, float]:
+    elapsed, peak, _ = _measure(lambda: [parse_line(line) for line in lines], memory)
+    return _metrics(len(lines), elapsed, peak)
+
+def bench_validate(lines: List[str], memory: bool) -> Dict[str, float]:
+    game = _game()
+    rows = [row for row in map(parse_line, lines) if row]
+    elapsed, peak, (codes, _) = _measure(lambda: validate_rows(rows, game.levels, game.variable_options, game.categories), memory)
+    times = [row['time'] for row in rows]
+    
+    def parse_all():
+        for t in times:
+            try:
+                parse_time(t)
+            except ValueError:
+                pass
+    
+    parse_elapsed, _, _ = _measure(parse_all, False)
+    return _metrics(len(rows), elapsed, peak, invalid=sum(1 for code in codes if code),
+                    parse_time_per_s=len(times) / parse_elapsed)
+
+def _import(path: str, tmp: str) -> Dict[str, float]:
+    store = QueueStore(os.path.join(tmp, f"queue{time.monotonic_ns()}.sqlite3"))
+    ledger = Ledger(os.path.join(tmp, 'submitted.jsonl'))
+    queued = set()
+    runs = []
+    blocks = []
+    importer = Importer(_game())
+    importer.start(path)
+    
+    # mirrors Window._poll_import, which handles one batch per Tk callback
+    while True:
+        try:
+            status, payload, _ = importer.events.get_nowait()
+        except Empty:
+            time.sleep(0.05)
+            continue
+        if status == 'done':
+            break
+        
+        start = time.perf_counter()
+        for run in payload:
+            fp = fingerprint(run)
+            if fp in queued or fp in ledger:
+                continue
+            queued.add(fp)
+            store.add(run)
+            runs.append(run)
+        blocks.append(time.perf_counter() - start)
+        time.sleep(0.001)
+    
+    store.close()
+    return {'runs': len(runs), 'ui_block_max_ms': max(blocks, default=0) * 1000,
+            'ui_block_total_ms': sum(blocks) * 1000}
+
+def bench_import(lines: List[str], memory: bool, tmp: str) -> Dict[str, float]:
+    path = os.path.join(tmp, f"import{len(lines)}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    
+    elapsed, peak, result = _measure(lambda: _import(path, tmp), memory)
+    return _metrics(len(lines), elapsed, peak, runs_per_s=result['runs'] / elapsed,
+                    ui_block_max_ms=result['ui_block_max_ms'], ui_block_total_ms=result['ui_block_total_ms'])
+
+def bench_submit(args: argparse.Namespace, tmp: str) -> Dict[str, float]:
+    runs = [run for run, _ in check_lines(make_lines(args.runs, seed=1), _game()) if run]
+    server = StubServer(args.latency, args.errors, args.throttle).start()
+    try:
+        # a replayed log stands in for the stub server, e.g. to rerun a recorded batch offline
+        sessions = [Session(local_api(server, os.path.join(tmp, 'game_bench.json'), rate=args.account_rate,
+                                      client=ReplayClient(args.replay, args.replay_speed) if args.replay else None),
+                            path=os.path.join(tmp, f"session{i}.json"))
+                    for i in range(args.accounts)]
+        submitter = Submitter(AccountPool(sessions), args.workers, Ledger(os.path.join(tmp, f"ledger{time.monotonic_ns()}.jsonl")))
+        counts = {'submitted': 0, 'duplicate': 0, 'failed': 0}
+        start = time.perf_counter()
+        submitter.start(runs)
+        while True:
+            status, _, _ = submitter.events.get()
+            if status == 'done':
+                break
+            counts[status] += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+    
+    return _metrics(counts['submitted'], elapsed, None, unit='runs', failed=counts['failed'])
+
+def bench_videos(args: argparse.Namespace) -> Dict[str, float]:
+    server = StubServer(args.latency).start()
+    try:
+        # every link shows up for a few runs, like the povs of one video, and a few are dead or private
+        urls = [f"{server.url}/video/{i}{'-dead' if i % 40 == 0 else '-private' if i % 40 == 1 else ''}"
+                for i in range(args.videos)]
+        queue = [url for url in urls for _ in range(3)]
+        checker = VideoChecker()
+        start = time.perf_counter()
+        results = checker.check_all(queue).result()
+        elapsed = time.perf_counter() - start
+        checker.close()
+    finally:
+        server.stop()
+    
+    return _metrics(len(queue), elapsed, None, unit='links', requests=server.counts.get(('video', 'ok'), 0),
+                    bad=sum(1 for result in results.values() if result != OK))
+
+def import_times(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    # a fresh interpreter each time, since anything already imported here would look free
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            capture_output=True, text=True, cwd=ROOT)
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return elapsed, times
+
+def bench_startup(args: argparse.Namespace) -> Dict[str, float]:
+    metrics = {}
+    for module in STARTUP_MODULES:
+        # best of a few runs, a cold start is mostly noise from the disk cache otherwise
+        elapsed, times = min((import_times(module) for _ in range(args.startup_runs)), key=lambda result: result[0])
+        name = module.rsplit('.', 1)[-1]
+        metrics[f"{name}_start_ms"] = elapsed * 1000
+        metrics[f"{name}_import_ms"] = times[module][1] / 1000
+        metrics[f"{name}_loads_speedruncompy"] = float('speedruncompy' in times)
+        if args.profile_imports:
+            print(f"slowest imports under {module}:")
+            for own, cumulative, child in sorted(((t[0], t[1], n) for n, t in times.items()), reverse=True)[:args.profile_imports]:
+                print(f"  {child:<40} {own / 1000:>8.2f} ms self {cumulative / 1000:>8.2f} ms total")
+    return metrics
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # anything that still falls back to data_dir() (aliases, sessions, caches) lands in tmp, not the user's data
+        os.environ['XDG_DATA_HOME'] = os.environ['LOCALAPPDATA'] = tmp
+        for count in args.lines:
+            lines = make_lines(count, args.invalid)
+            if 'parse' in args.suite:
+                results[f"parse[{count}]"] = bench_parse(lines, args.memory)
+            if 'validate' in args.suite:
+                results[f"validate[{count}]"] = bench_validate(lines, args.memory)
+            if 'import' in args.suite:
+                results[f"import[{count}]"] = bench_import(lines, args.memory, tmp)
+        if 'submit' in args.suite:
+            results[f"submit[{args.runs}]"] = bench_submit(args, tmp)
+        if 'videos' in args.suite:
+            results[f"videos[{args.videos}]"] = bench_videos(args)
+        if 'startup' in args.suite:
+            results['startup'] = bench_startup(args)
+    return results
+
+def _worse(metric: str, old: float, new: float, tolerance: float) -> bool:
+    if not metric.endswith(COMPARED):
+        return False
+    if metric.endswith('_per_s'):
+        return new < old * (1 - tolerance)
+    return new > old * (1 + tolerance)
+
+def report(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]], tolerance: float) -> int:
+    regressions = 0
+    for name, metrics in results.items():
+        print(name)
+        for metric, value in metrics.items():
+            line = f"  {metric:<20} {value:>14,.2f}"
+            old = (baseline or {}).get(name, {}).get(metric)
+            if old:
+                worse = _worse(metric, old, value, tolerance)
+                regressions += worse
+                line += f"  {value / old:>6.2f}x baseline{'  REGRESSION' if worse else ''}"
+            print(line)
+    return regressions
+
+def _sizes(value: str) -> List[int]:
+    return [int(float(size.lower().replace('k', 'e3').replace('m', 'e6'))) for size in value.split(',')]
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark the import, validation and submission paths.")
+    parser.add_argument('--suite', type=lambda v: v.split(','), default=list(SUITES), help=f"comma separated, from {', '.join(SUITES)}")
+    parser.add_argument('--lines', type=_sizes, default=[1000, 10000, 100000], help="import sizes, e.g. 1k,100k,1m (default: 1k,10k,100k)")
+    parser.add_argument('--invalid', type=float, default=0.05, help="fraction of generated lines with a bad field")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="skip the tracemalloc pass")
+    parser.add_argument('--runs', type=int, default=200, help="runs to submit to the stub server")
+    parser.add_argument('--videos', type=int, default=200, help="distinct video links to check, each queued three times")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--accounts', type=int, default=1, help="accounts in the submission pool")
+    parser.add_argument('--account-rate', type=float, default=1000.0, help="request rate limit per account")
+    parser.add_argument('--latency', type=float, default=0.02, help="stub server latency in seconds")
+    parser.add_argument('--errors', type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument('--throttle', type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument('--replay', metavar='PATH', help="answer submissions from a request log recorded with --record")
+    parser.add_argument('--replay-speed', type=float, default=1.0, help="replay at this multiple of the recorded latency, 0 for full speed")
+    parser.add_argument('--startup-runs', type=int, default=5, help="interpreter launches per startup measurement (best is kept)")
+    parser.add_argument('--profile-imports', type=int, default=0, metavar='N', help="print the N slowest imports behind each entry point")
+    parser.add_argument('--save', metavar='PATH', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="allowed slowdown before flagging (default: %(default)s)")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    logging.getLogger('speedruncompy').setLevel(logging.CRITICAL)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    
+    results = run(args)
+    regressions = report(results, baseline, args.tolerance)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
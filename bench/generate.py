@@ -0,0 +1,46 @@
+import argparse
+import random
+from typing import List
+
+from src.config import VARIABLES
+
+LEVELS = [f"Map {i}" for i in range(1, 41)]
+PLAYERS = [f"runner{i}" for i in range(200)]
+BAD_FIELDS = {
+    'time': ["1:2:3:4", "1:75", "abc", "0:00"],
+    'map': ["Mpa 1", "Nowhere"],
+    'video': ["youtu.be/x", "https://"],
+    'players': [" , "],
+}
+
+def make_line(rng: random.Random, invalid: float = 0.0) -> str:
+    fields = {
+        'players': ','.join(rng.sample(PLAYERS, rng.randint(1, 5))),
+        'map': rng.choice(LEVELS),
+        'time': f"{rng.randint(0, 9)}:{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d}",
+        'variable': rng.choice(list(VARIABLES['options'])),
+        'video': f"https://youtu.be/{rng.getrandbits(48):012x}",
+    }
+    if invalid and rng.random() < invalid:
+        field = rng.choice(list(BAD_FIELDS))
+        fields[field] = rng.choice(BAD_FIELDS[field])
+    return ' | '.join(fields.values())
+
+def make_lines(count: int, invalid: float = 0.0, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [make_line(rng, invalid) for _ in range(count)]
+
+def generate(path: str, count: int, invalid: float = 0.0, seed: int = 0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(count):
+            f.write(make_line(rng, invalid) + '\n')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic import file.")
+    parser.add_argument('path')
+    parser.add_argument('--lines', type=int, default=10000)
+    parser.add_argument('--invalid', type=float, default=0.05, help="fraction of lines with one bad field")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.path, args.lines, args.invalid, args.seed)
@@ -0,0 +1,145 @@
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from bench.generate import LEVELS
+from src.api import API
+from src.client import Client
+from src.cache import GameDataCache
+from src.config import CATEGORIES, VARIABLES
+from src.ratelimit import RateLimiter
+
+def game_data(game_id: str) -> Dict[str, Any]:
+    return {
+        'game': {'id': game_id, 'name': "Bench"},
+        'categories': [{'id': f"c{i}", 'name': name} for i, name in enumerate(CATEGORIES)],
+        'levels': [{'id': f"l{i}", 'name': name, 'url': name.lower().replace(' ', '-')} for i, name in enumerate(LEVELS)],
+        'variables': [{'id': VARIABLES['variable_id'], 'name': "Gear", 'isSubcategory': True}],
+        'values': [{'id': value_id, 'name': name, 'variableId': VARIABLES['variable_id']}
+                   for name, value_id in VARIABLES['options'].items()],
+        'platforms': [{'id': "8gej2n93", 'name': "PC"}, {'id': "bench-console", 'name': "Console"}],
+    }
+
+class StubServer:
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 0.1, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.run_ids = itertools.count(1)
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def start(self) -> 'StubServer':
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def _outcome(self, endpoint: str) -> str:
+        with self.lock:
+            roll = self.rng.random()
+            outcome = 'throttled' if roll < self.throttle_rate else 'error' if roll < self.throttle_rate + self.error_rate else 'ok'
+            self.counts[(endpoint, outcome)] = self.counts.get((endpoint, outcome), 0) + 1
+            return outcome
+    
+    def _respond(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        if endpoint == 'GetGameData':
+            return game_data("bench")
+        if endpoint == 'PutAuthLogin':
+            return {'loggedIn': True, 'tokenChallengeSent': False}
+        if endpoint == 'GetSession':
+            return {'session': {'signedIn': True, 'csrfToken': "bench-token"}}
+        if endpoint == 'GetGameLeaderboard2':
+            return {'runList': [], 'playerList': [], 'platformList': [], 'pagination': {'count': 0, 'page': 1, 'pages': 1, 'per': 100}}
+        if endpoint == 'PutRunSettings':
+            return {'runId': f"bench{next(self.run_ids)}"}
+        return None
+    
+    def _video(self, path: str) -> int:
+        # /video/<id>, ids ending in -dead or -private stand in for removed and private videos
+        with self.lock:
+            self.counts[('video', 'ok')] = self.counts.get(('video', 'ok'), 0) + 1
+        name = path.split('?')[0].rsplit('/', 1)[-1]
+        return 404 if name.endswith('-dead') else 403 if name.endswith('-private') else 200
+    
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def _serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                endpoint = self.path.split('?')[0].rsplit('/', 1)[-1]
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if self.path.startswith('/video/'):
+                    self.send_response(stub._video(self.path))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                
+                body = stub._respond(endpoint)
+                outcome = stub._outcome(endpoint)
+                if body is None:
+                    self.send_response(404)
+                elif outcome == 'throttled':
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(stub.retry_after))
+                elif outcome == 'error':
+                    self.send_response(500)
+                else:
+                    self.send_response(200)
+                data = json.dumps(body or {}).encode()
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            do_GET = _serve
+            do_POST = _serve
+            do_HEAD = _serve
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+class LocalClient(Client):
+    def __init__(self, base_url: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.base_url = base_url
+    
+    async def _construct_session(self):
+        if self.cookie_jar is None:
+            self.cookie_jar = aiohttp.CookieJar(unsafe=True)
+            self.cookie_jar.update_cookies(self.loose_cookies)
+        return aiohttp.ClientSession(base_url=self.base_url, cookie_jar=self.cookie_jar, headers=self._header)
+
+def local_api(server: StubServer, cache_path: str, game_id: str = "bench", rate: float = 1000.0,
+              client: Optional[Client] = None) -> API:
+    api = API(game_id, rate)
+    api.api = client or LocalClient(server.url)
+    api.limiter = RateLimiter(rate, burst=max(1, int(rate)), max_rate=rate)
+    api.caches[game_id] = GameDataCache(game_id, path=cache_path)
+    api.csrf_token = "bench-token"
+    return api
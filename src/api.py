@@ -1,52 +1,203 @@
+import threading
 import time
-from typing import Dict, Any, Optional
-from speedruncompy.api import SpeedrunClient
-from speedruncompy.endpoints import GetGameData, PutRunSettings, PutAuthLogin
-from speedruncompy.auth import get_CSRF
-from speedruncompy.datatypes import RunSettings
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+from src.cache import GameDataCache, game_maps
+from src.config import PLATFORM_ID
+from src.models import Run
+from src.ratelimit import RateLimiter, RetryBudget, backoff
+from src.telemetry import Telemetry
+
+# speedruncompy pulls in aiohttp and takes longer to import than the whole window takes to draw,
+# so it's only imported by the first request, which always runs on a worker thread
+if TYPE_CHECKING:
+    from speedruncompy.datatypes.enums import VerifiedFilter
+    from src.client import Client
 
 class API:
-    def __init__(self, game_id: str):
-        self.api = SpeedrunClient()
+    def __init__(self, game_id: str, rate: float = 2.0, max_retries: int = 5, client: Optional['Client'] = None):
+        self._client = client
+        self._session_id = None
+        self.client_lock = threading.Lock()
         self.game_id = game_id
         self.csrf_token = None
-        self.game_data = None
+        self.limiter = RateLimiter(rate, burst=4)
+        self.retry_budget = RetryBudget()
+        self.max_retries = max_retries
+        self.caches = {}
+        self.csrf_lock = threading.Lock()
+        self.telemetry = Telemetry()
+    
+    @property
+    def api(self) -> 'Client':
+        if self._client is None:
+            with self.client_lock:
+                if self._client is None:
+                    from src.client import Client
+                    client = Client()
+                    if self._session_id:
+                        client.PHPSESSID = self._session_id
+                    self._client = client
+        return self._client
+    
+    @api.setter
+    def api(self, client: 'Client'):
+        self._client = client
+    
+    @property
+    def session_id(self) -> Optional[str]:
+        return self._client.session_id() if self._client is not None else self._session_id
+    
+    @session_id.setter
+    def session_id(self, value: str):
+        self._session_id = value
+        if self._client is not None:
+            self._client.PHPSESSID = value
+    
+    def _perform(self, request, retry_on: Optional[Tuple[type, ...]] = None) -> Any:
+        from speedruncompy.exceptions import RateLimitExceeded
+        from src.client import RETRYABLE
+        
+        retry_on = retry_on or RETRYABLE
+        endpoint = request.endpoint
+        attempt = 0
+        while True:
+            with self.telemetry.timer('limiter_wait_seconds'):
+                self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                result = request.perform(retries=0)
+            except Exception as e:
+                self.telemetry.observe('request_seconds', time.perf_counter() - start, endpoint=endpoint)
+                self.telemetry.inc('requests_total', endpoint=endpoint, outcome=type(e).__name__)
+                if not isinstance(e, retry_on):
+                    raise
+                
+                retry_after = self.api.retry_after()
+                if isinstance(e, RateLimitExceeded):
+                    self.limiter.on_throttle(retry_after)
+                    self.telemetry.set('request_rate', self.limiter.rate)
+                if attempt >= self.max_retries or not self.retry_budget.withdraw():
+                    raise
+                delay = backoff(attempt, retry_after=retry_after)
+                self.telemetry.inc('retries_total', endpoint=endpoint)
+                self.telemetry.observe('backoff_seconds', delay)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.telemetry.observe('request_seconds', time.perf_counter() - start, endpoint=endpoint)
+            self.telemetry.inc('requests_total', endpoint=endpoint, outcome='ok')
+            self.limiter.on_success()
+            self.telemetry.set('request_rate', self.limiter.rate)
+            self.retry_budget.deposit()
+            return result
         
     def login(self, username: str, password: str, token: Optional[str] = None):
-        return PutAuthLogin(username, password, token, _api=self.api).perform()
+        from speedruncompy.endpoints import PutAuthLogin
+        return self._perform(PutAuthLogin(username, password, token, _api=self.api))
     
     def get_csrf_token(self) -> str:
-        self.csrf_token = get_CSRF(_api=self.api)
+        from speedruncompy.endpoints import GetSession
+        from speedruncompy.exceptions import AuthException
+        
+        session = self._perform(GetSession(_api=self.api))['session']
+        if not session.get('signedIn', False):
+            raise AuthException("Not logged in, cannot retrieve csrfToken")
+        self.csrf_token = session.get('csrfToken')
         return self.csrf_token
     
-    def fetch_game_data(self) -> Dict[str, Any]:
-        self.game_data = GetGameData(gameId=self.game_id).perform()
-        return self.game_data
+    def refresh_csrf_token(self, stale: Optional[str]) -> str:
+        with self.csrf_lock:
+            if self.csrf_token == stale:
+                self.get_csrf_token()
+            return self.csrf_token
+    
+    def game_cache(self, game_id: Optional[str] = None) -> GameDataCache:
+        game_id = game_id or self.game_id
+        if game_id not in self.caches:
+            self.caches[game_id] = GameDataCache(game_id)
+        return self.caches[game_id]
+        
+    def fetch_game_data(self, refresh: bool = False, game_id: Optional[str] = None) -> Dict[str, Any]:
+        game_id = game_id or self.game_id
+        cache = self.game_cache(game_id)
+        entry = None if refresh else cache.load()
+        if not cache.is_stale(entry):
+            return entry['data']
+        
+        from speedruncompy.endpoints import GetGameData
+        try:
+            game_data = game_maps(self._perform(GetGameData(gameId=game_id, _api=self.api)))
+        except Exception:
+            # offline or speedrun.com is down, stale game data still validates almost every line
+            if entry is None:
+                raise
+            return entry['data']
+        cache.save(game_data)
+        return game_data
     
-    def submit_run(self, data: Dict[str, Any], time_obj: Dict[str, int]) -> Any:
+    def leaderboard_runs(self, game_id: str, category_id: str, level_id: Optional[str],
+                         verified: 'VerifiedFilter') -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        from speedruncompy.datatypes.enums import ObsoleteFilter, VideoFilter
+        from speedruncompy.endpoints import GetGameLeaderboard2
+        
+        runs = []
+        players = {}
+        page = 1
+        while True:
+            # obsolete and video-less runs still count as already submitted
+            result = self._perform(GetGameLeaderboard2(
+                gameId=game_id, categoryId=category_id, levelId=level_id, verified=verified,
+                obsolete=ObsoleteFilter.SHOWN, video=VideoFilter.OPTIONAL, page=page, _api=self.api
+            ))
+            runs.extend(result.get('runList') or [])
+            for player in result.get('playerList') or []:
+                players[player['id']] = player['name']
+            if page >= (result.get('pagination') or {}).get('pages', 1):
+                return runs, players
+            page += 1
+    
+    def submit_run(self, run: Run) -> Any:
+        from speedruncompy.datatypes import RunSettings
+        from speedruncompy.endpoints import PutRunSettings
+        from speedruncompy.exceptions import Forbidden, RateLimitExceeded, Unauthorized
+        
         settings = {
-            'levelId': data['level_id'],
-            'categoryId': data['category_id'],
-            'playerNames': [p.strip() for p in data['players'].split(',') if p.strip()],
-            'gameId': self.game_id,
-            'platformId': "8gej2n93", # pc
+            'levelId': run.level_id,
+            'categoryId': run.category_id,
+            'playerNames': list(run.players),
+            'gameId': run.game_id or self.game_id,
+            # runs queued before multi-game support carry no platform and are all for the default game
+            'platformId': run.platform_id or PLATFORM_ID,
             'date': int(time.time()),
-            'video': data['video'],
+            'video': run.video,
             'videoState': 0,
-            'comment': data['description'],
-            'time': time_obj,
+            'comment': run.description,
+            'time': run.time_dict(),
         }
         
-        if data.get('variable_id') and data.get('variable_value_id'):
+        if run.variable_id and run.variable_value_id:
             settings['values'] = [{
-                'variableId': data['variable_id'],
-                'valueId': data['variable_value_id']
+                'variableId': run.variable_id,
+                'valueId': run.variable_value_id
             }]
         
         run_settings = RunSettings(settings)
-        return PutRunSettings(
-            csrfToken=self.csrf_token,
-            settings=run_settings,
-            autoverify=False,
-            _api=self.api
-        ).perform()
+        # a timeout or 5xx may come after the run was stored, only a 429 is sure to have been turned away
+        retry_on = (RateLimitExceeded,)
+        token = self.csrf_token
+        try:
+            return self._perform(PutRunSettings(
+                csrfToken=token,
+                settings=run_settings,
+                autoverify=False,
+                _api=self.api
+            ), retry_on)
+        except (Unauthorized, Forbidden):
+            # csrf tokens expire with the session, so fetch a fresh one once before giving up
+            return self._perform(PutRunSettings(
+                csrfToken=self.refresh_csrf_token(token),
+                settings=run_settings,
+                autoverify=False,
+                _api=self.api
+            ), retry_on)
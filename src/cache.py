@@ -0,0 +1,52 @@
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+from src.utils import data_dir
+
+CACHE_VERSION = 3
+CACHE_TTL = 24 * 60 * 60
+
+def game_maps(game_response) -> Dict[str, Any]:
+    values = {}
+    for value in game_response.get('values') or []:
+        values.setdefault(value['variableId'], {})[value['name']] = value['id']
+    
+    game = game_response.get('game') or {}
+    return {
+        'name': game.get('name'),
+        'categories': {c['name']: c['id'] for c in game_response.get('categories') or []},
+        'levels': {l['name']: l['id'] for l in game_response.get('levels') or []},
+        'level_aliases': {l['url']: l['name'] for l in game_response.get('levels') or [] if l.get('url')},
+        'variables': {v['name']: {'id': v['id'], 'values': values.get(v['id'], {}), 'subcategory': bool(v.get('isSubcategory'))}
+                      for v in game_response.get('variables') or []},
+        'platforms': {p['name']: p['id'] for p in game_response.get('platforms') or []},
+    }
+
+class GameDataCache:
+    def __init__(self, game_id: str, ttl: float = CACHE_TTL, path: Optional[str] = None):
+        self.game_id = game_id
+        self.ttl = ttl
+        self.path = path or os.path.join(data_dir(), f"game_{game_id}.json")
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if entry.get('version') != CACHE_VERSION or entry.get('game_id') != self.game_id:
+            return None
+        return entry
+    
+    def save(self, data: Dict[str, Any]):
+        entry = {'version': CACHE_VERSION, 'game_id': self.game_id, 'fetched_at': time.time(), 'data': data}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, self.path)
+    
+    def is_stale(self, entry: Optional[Dict[str, Any]]) -> bool:
+        return entry is None or time.time() - entry.get('fetched_at', 0) > self.ttl
@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from src.api import API
+from src.dedupe import Ledger, fingerprint
+from src.config import GAME_ID, SUBMIT_WORKERS, REQUEST_RATE
+from src.games import Game, GameRegistry
+from src.formats import READERS, format_for, read_records
+from src.importer import iter_checked
+from src.models import Run
+from src.pipeline import Pipeline
+from src.pool import AccountPool
+from src.reconcile import Reconciler
+from src.session import Session
+from src.submitter import Submitter
+from src.videos import DEAD, MESSAGES as VIDEO_MESSAGES, PRIVATE, VideoChecker
+
+if TYPE_CHECKING:
+    from src.client import Client
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_ERROR = 2
+
+_emit_lock = threading.Lock()
+
+def _emit(obj: Dict[str, Any]):
+    # streamed imports report invalid lines from the submitter thread
+    with _emit_lock:
+        sys.stdout.write(json.dumps(obj) + '\n')
+        sys.stdout.flush()
+
+def _fail(message: str) -> int:
+    print(f"scribble: {message}", file=sys.stderr)
+    return EXIT_ERROR
+
+def _login(api: API) -> Optional[str]:
+    session = os.environ.get('SCRIBBLE_SESSION')
+    username = os.environ.get('SCRIBBLE_USERNAME')
+    password = os.environ.get('SCRIBBLE_PASSWORD')
+    if session:
+        api.session_id = session
+    elif not username and Session(api).restore():
+        # reuse the GUI's saved session, still checked by the csrf fetch below
+        pass
+    else:
+        if not username or not password:
+            return "log in through the GUI, or set SCRIBBLE_SESSION, or SCRIBBLE_USERNAME and SCRIBBLE_PASSWORD"
+        
+        result = api.login(username, password)
+        if result.get('tokenChallengeSent'):
+            token = os.environ.get('SCRIBBLE_2FA_TOKEN')
+            if not token:
+                return "account has 2FA enabled, set SCRIBBLE_2FA_TOKEN"
+            result = api.login(username, password, token)
+        if not result.get('loggedIn'):
+            return "login failed"
+    
+    api.get_csrf_token()
+    return None
+
+def _client(args: argparse.Namespace) -> Optional[Callable[[], 'Client']]:
+    if not (args.record or args.replay or args.dry_run):
+        # the API creates its own client on the first request, so --validate-only never loads speedruncompy
+        return None
+    
+    from src.client import Client
+    from src.replay import DryRunClient, Recorder, ReplayClient
+    
+    recorder = Recorder(args.record) if args.record else None
+    
+    def make() -> 'Client':
+        if args.replay:
+            client = ReplayClient(args.replay, args.replay_speed)
+        elif args.dry_run:
+            client = DryRunClient()
+        else:
+            client = Client()
+        client.recorder = recorder
+        return client
+    return make
+
+def _submitter(api: API, args: argparse.Namespace, ledger: Ledger) -> Tuple[Optional[Submitter], Optional[str]]:
+    try:
+        error = _login(api)
+    except Exception as e:
+        error = f"login failed: {e}"
+    if error:
+        return None, error
+    
+    pool = AccountPool([Session(api)])
+    if args.all_accounts:
+        for session in pool.restore(args.game, args.rate, args.client):
+            try:
+                session.api.get_csrf_token()
+            except Exception:
+                pool.remove(session)
+    reconciler = None if args.no_reconcile else Reconciler(api)
+    return Submitter(pool, args.workers, ledger, reconciler=reconciler), None
+
+def _drain(submitter: Submitter, line_of: Callable[[Run], Optional[int]], summary: Dict[str, int]):
+    while True:
+        status, run, result = submitter.events.get()
+        if status == 'done':
+            break
+        
+        summary[status] += 1
+        if status in ('submitted', 'duplicate'):
+            run_id = result if status == 'duplicate' else result.get('runId')
+            entry = {'line': line_of(run), 'status': status, 'run_id': run_id}
+            if status == 'submitted' and result.get('dryRun'):
+                entry['payload'] = result['dryRun']
+            _emit(entry)
+        else:
+            _emit({'line': line_of(run), 'status': status, 'error': f"{type(result).__name__}: {result}"})
+
+def _stream(api: API, args: argparse.Namespace, game: Game, source: BinaryIO) -> int:
+    submitter, error = _submitter(api, args, Ledger(readonly=args.offline))
+    if error:
+        return _fail(error)
+    
+    summary = {'submitted': 0, 'duplicate': 0, 'failed': 0, 'invalid': 0}
+    def on_invalid(line_num: int, error: str):
+        summary['invalid'] += 1
+        _emit({'line': line_num, 'status': 'invalid', 'error': error})
+    
+    pipeline = Pipeline(game, submitter, fmt=args.format, on_invalid=on_invalid, track_lines=True)
+    with source:
+        pipeline.start(source)
+        _drain(submitter, pipeline.line_of, summary)
+    return _finish(api, args, summary)
+
+def _check_videos(api: API, runs: List[Run], lines: Dict[int, int]) -> List[Run]:
+    results = VideoChecker(telemetry=api.telemetry).check_all(run.video for run in runs).result()
+    kept = []
+    for run in runs:
+        # an unreachable host isn't the run's fault, so only dead and private links are held back
+        result = results[run.video]
+        if result in (DEAD, PRIVATE):
+            _emit({'line': lines[id(run)], 'status': 'invalid', 'error': f"{VIDEO_MESSAGES[result]} ({run.video})"})
+        else:
+            kept.append(run)
+    return kept
+
+def _finish(api: API, args: argparse.Namespace, summary: Dict[str, int]) -> int:
+    _emit({'summary': summary})
+    if args.stats:
+        try:
+            api.telemetry.export(args.stats)
+        except OSError as e:
+            print(f"scribble: failed to write stats: {e}", file=sys.stderr)
+    return EXIT_OK if not summary['failed'] and not summary['invalid'] else EXIT_FAILED
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="scribble", description="Mass-submit runs from an import file without the GUI.")
+    parser.add_argument('file', nargs='?', default='-', help="import file, or - for stdin (default)")
+    parser.add_argument('--format', choices=sorted(READERS), help="import file format (default: from the file extension, pipe for stdin)")
+    parser.add_argument('--game', default=GAME_ID, help="game ID (default: %(default)s)")
+    parser.add_argument('--platform', help="platform name or ID (default: the game's first platform)")
+    parser.add_argument('--category', help="category for lines without one, when the game has no Solo/Duo/... category")
+    parser.add_argument('--workers', type=int, default=SUBMIT_WORKERS, help="concurrent submissions (default: %(default)s)")
+    parser.add_argument('--rate', type=float, default=REQUEST_RATE, help="starting requests per second (default: %(default)s)")
+    parser.add_argument('--all-accounts', action='store_true', help="also submit with every extra account logged in through the GUI")
+    parser.add_argument('--stats', metavar='PATH', help="write request/submission stats on exit (.json, .csv or .prom)")
+    parser.add_argument('--stream', action='store_true', help="submit runs as they are read instead of validating the whole file first")
+    parser.add_argument('--check-videos', action='store_true', help="check that every video link is reachable and public first (not with --stream)")
+    parser.add_argument('--no-reconcile', action='store_true', help="don't skip runs that are already on the leaderboard or pending")
+    parser.add_argument('--dry-run', action='store_true', help="print the payload of every run instead of submitting it")
+    parser.add_argument('--record', metavar='PATH', help="log every request and response to PATH (.jsonl, or .jsonl.gz)")
+    parser.add_argument('--replay', metavar='PATH', help="answer requests from a recorded log instead of speedrun.com")
+    parser.add_argument('--replay-speed', type=float, default=1.0, metavar='X',
+                        help="replay at X times the recorded latency, 0 for full speed (default: %(default)s)")
+    parser.add_argument('--validate-only', action='store_true', help="validate the file and exit without submitting")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    if args.check_videos and args.stream and not args.validate_only:
+        # a streamed run is submitted before the rest of the file is read, so its link can't be held back
+        return _fail("--check-videos can't be combined with --stream")
+    # dry runs and replays still skip what was really submitted, but don't record their own fake run IDs
+    args.offline = args.dry_run or bool(args.replay)
+    try:
+        args.client = _client(args)
+    except (OSError, ValueError) as e:
+        return _fail(f"failed to open request log: {e}")
+    api = API(args.game, args.rate, client=args.client and args.client())
+    
+    try:
+        game = GameRegistry(api).get(args.game)
+    except Exception as e:
+        return _fail(f"failed to fetch game data: {e}")
+    
+    if args.platform:
+        game.platform_id = game.platform(args.platform)
+        if not game.platform_id:
+            return _fail(f"unknown platform {args.platform}, expected one of: {', '.join(game.platforms)}")
+    if args.category:
+        if args.category not in game.categories:
+            return _fail(f"unknown category {args.category}, expected one of: {', '.join(game.categories)}")
+        game.default_category = args.category
+    
+    ledger = Ledger(readonly=args.offline)
+    queued = set()
+    runs = []
+    lines = {}
+    invalid = 0
+    try:
+        source = sys.stdin.buffer if args.file == '-' else open(args.file, 'rb')
+    except OSError as e:
+        return _fail(str(e))
+    if not args.format and args.file != '-':
+        args.format = format_for(args.file)
+    
+    if args.stream and not args.validate_only:
+        return _stream(api, args, game, source)
+    
+    try:
+        with source:
+            for line_num, _, run, error in iter_checked(read_records(source, args.format), game):
+                if error:
+                    invalid += 1
+                    _emit({'line': line_num, 'status': 'invalid', 'error': error})
+                    continue
+            
+                fp = fingerprint(run)
+                if fp in queued:
+                    invalid += 1
+                    _emit({'line': line_num, 'status': 'invalid', 'error': "Duplicate of an earlier line"})
+                    continue
+            
+                queued.add(fp)
+                lines[id(run)] = line_num
+                runs.append(run)
+    except Exception as e:
+        return _fail(f"failed to read {args.file}: {e}")
+    
+    if args.check_videos and runs:
+        kept = _check_videos(api, runs, lines)
+        invalid += len(runs) - len(kept)
+        runs = kept
+    
+    summary = {'submitted': 0, 'duplicate': 0, 'failed': 0, 'invalid': invalid}
+    if not args.validate_only and runs:
+        submitter, error = _submitter(api, args, ledger)
+        if error:
+            return _fail(error)
+        submitter.start(runs)
+        _drain(submitter, lambda run: lines[id(run)], summary)
+        
+    return _finish(api, args, summary)
+
+if __name__ == "__main__":
+    sys.exit(main())
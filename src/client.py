@@ -0,0 +1,58 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+from speedruncompy.api import SpeedrunClient, API_ROOT
+from speedruncompy.exceptions import RateLimitExceeded, RequestTimeout, ServerException
+
+RETRYABLE = (RateLimitExceeded, ServerException, RequestTimeout)
+
+class Client(SpeedrunClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_response = threading.local()
+        self.recorder = None
+    
+    def session_id(self) -> Optional[str]:
+        # cookies set by speedrun.com are scoped to its domain, which PHPSESSID's host-less lookup never matches
+        if self.cookie_jar is None:
+            return self.loose_cookies.get('PHPSESSID')
+        for cookie in self.cookie_jar:
+            if cookie.key == 'PHPSESSID':
+                return cookie.value
+        return None
+    
+    def retry_after(self) -> Optional[float]:
+        value = getattr(self.last_response, 'retry_after', None)
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    
+    async def _request(self, method: str, endpoint: str, **kwargs) -> Tuple[bytes, int]:
+        async with await self._construct_session() as session:
+            async with session.request(method, f"{API_ROOT}{endpoint}", **kwargs) as response:
+                self.last_response.retry_after = response.headers.get('Retry-After')
+                return (await response.read(), response.status)
+    
+    async def _transport(self, method: str, endpoint: str, params: dict) -> Tuple[bytes, int]:
+        if method == 'GET':
+            return await self._request('GET', endpoint, params={"_r": self._encode_r(params)})
+        return await self._request('POST', endpoint, json=params)
+    
+    async def _exchange(self, method: str, endpoint: str, params: dict) -> Tuple[bytes, int]:
+        start = time.perf_counter()
+        body, status = await self._transport(method, endpoint, params)
+        if self.recorder is not None:
+            self.recorder.write(method, endpoint, params, body, status, time.perf_counter() - start,
+                                getattr(self.last_response, 'retry_after', None))
+        return body, status
+    
+    async def do_get(self, endpoint: str, params: dict = {}) -> Tuple[bytes, int]:
+        return await self._exchange('GET', endpoint, params)
+    
+    async def do_post(self, endpoint: str, params: dict = {}) -> Tuple[bytes, int]:
+        return await self._exchange('POST', endpoint, params)
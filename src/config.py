@@ -0,0 +1,20 @@
+GAME_ID = "nd27np51" # color book
+PLATFORM_ID = "8gej2n93" # pc
+
+CATEGORIES = {
+    "Solo": None, 
+    "Duo": None, 
+    "Trio": None,
+    "Quartet": None,
+    "Squad": None
+}
+VARIABLES = {
+    'variable_id': 'onv520ml', # gears?
+    'options': {
+        'Gearless': 'q757r8p1',
+        'Gear': '1gnx2m6l'
+    }
+}
+
+SUBMIT_WORKERS = 4
+REQUEST_RATE = 2.0 # starting requests per second, adapts to throttling
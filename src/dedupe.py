@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from src.models import Run
+from src.utils import data_dir
+
+def fingerprint(run: Run) -> str:
+    players = sorted(p.casefold() for p in run.players)
+    minute, second, millisecond = run.time_obj
+    
+    key = '\x1f'.join((
+        run.category_id or run.category,
+        run.level_id or run.level,
+        run.variable_value_id or run.variable or '',
+        ','.join(players),
+        f"{minute}:{second}.{millisecond}",
+    ))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+class Ledger:
+    def __init__(self, path: Optional[str] = None, readonly: bool = False):
+        self.path = path or os.path.join(data_dir(), 'submitted.jsonl')
+        self.readonly = readonly
+        self.runs = {}
+        self.lock = threading.Lock()
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.runs[entry['fingerprint']] = entry.get('run_id')
+        except OSError:
+            pass
+    
+    def __contains__(self, fp: str) -> bool:
+        return fp in self.runs
+    
+    def get(self, fp: str) -> Optional[str]:
+        return self.runs.get(fp)
+    
+    def record(self, fp: str, run_id: Optional[str]):
+        with self.lock:
+            self.runs[fp] = run_id
+            if self.readonly:
+                return
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'fingerprint': fp, 'run_id': run_id, 'submitted_at': int(time.time())}) + '\n')
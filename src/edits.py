@@ -0,0 +1,141 @@
+from dataclasses import fields, replace
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.dedupe import fingerprint
+from src.games import Game
+from src.importer import check_rows
+from src.models import Run
+from src.utils import get_category
+
+FIND_FIELDS = ('players', 'map', 'time')
+UNDO_LIMIT = 100
+
+SNAPSHOT_FIELDS = tuple(f.name for f in fields(Run) if f.name != 'queue_id')
+
+Change = Callable[[Dict[str, str]], Dict[str, str]]
+
+def fields_of(run: Run) -> Dict[str, str]:
+    return {
+        'category': run.category or '',
+        'map': run.level or '',
+        'variable': run.variable or '',
+        'players': run.players_text,
+        'time': run.time,
+        'video': run.video,
+        'description': run.description,
+        'platform': run.platform_id or '',
+    }
+
+def snapshot(run: Run) -> Tuple:
+    return tuple(getattr(run, name) for name in SNAPSHOT_FIELDS)
+
+def restore(run: Run, values: Tuple):
+    for name, value in zip(SNAPSHOT_FIELDS, values):
+        setattr(run, name, value)
+
+def fingerprint_as(run: Run, values: Tuple) -> str:
+    probe = replace(run)
+    restore(probe, values)
+    return fingerprint(probe)
+
+def set_field(key: str, value: str) -> Change:
+    def change(run_data: Dict[str, str]) -> Dict[str, str]:
+        run_data[key] = value.strip()
+        return run_data
+    return change
+
+def find_replace(find: str, replace: str, keys: Iterable[str] = FIND_FIELDS) -> Change:
+    def change(run_data: Dict[str, str]) -> Dict[str, str]:
+        for key in keys:
+            run_data[key] = run_data[key].replace(find, replace).strip()
+        return run_data
+    return change
+
+class Edit:
+    # runs are edited in place so the queue, selection and store keep pointing at the same objects
+    def __init__(self, label: str, changes: List[Tuple[Run, Tuple, Tuple]]):
+        self.label = label
+        self.changes = changes
+    
+    def states(self, undo: bool) -> List[Tuple[Run, Tuple]]:
+        return [(run, before if undo else after) for run, before, after in self.changes]
+    
+    def apply(self):
+        for run, _, after in self.changes:
+            restore(run, after)
+    
+    def revert(self):
+        for run, before, _ in self.changes:
+            restore(run, before)
+
+def build_edit(label: str, runs: Iterable[Run], change: Change, game_for: Callable[[Optional[str]], Optional[Game]],
+               queued: Set[str]) -> Tuple[Optional[Edit], List[Tuple[Run, str]]]:
+    pending = {}
+    for run in runs:
+        old = fields_of(run)
+        new = change(dict(old))
+        if new == old:
+            continue
+        # a category that was only implied by the player count follows the new players
+        if new['players'] != old['players'] and old['category'] == (get_category(old['players']) or ''):
+            new['category'] = get_category(new['players']) or ''
+        pending.setdefault(run.game_id, []).append((run, new))
+    
+    changes = []
+    errors = []
+    released = {fingerprint(run) for items in pending.values() for run, _ in items}
+    taken = set()
+    for game_id, items in pending.items():
+        game = game_for(game_id)
+        if game is None:
+            errors.extend((run, f"Game {game_id} isn't loaded") for run, _ in items)
+            continue
+        
+        # edited runs are validated exactly like imported lines, a column at a time
+        for (run, _), (new_run, error) in zip(items, check_rows([run_data for _, run_data in items], game)):
+            if not error:
+                fp = fingerprint(new_run)
+                if fp in taken or (fp in queued and fp not in released):
+                    error = "Would duplicate another queued run"
+                taken.add(fp)
+            if error:
+                errors.append((run, error))
+            else:
+                changes.append((run, snapshot(run), snapshot(new_run)))
+    return (Edit(label, changes) if changes else None), errors
+
+class EditLog:
+    def __init__(self, limit: int = UNDO_LIMIT):
+        self.limit = limit
+        self.done = []
+        self.undone = []
+    
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.done)
+    
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.undone)
+    
+    def push(self, edit: Edit):
+        edit.apply()
+        self.done.append(edit)
+        del self.done[:-self.limit]
+        self.undone.clear()
+    
+    def undo(self) -> Optional[Edit]:
+        if not self.done:
+            return None
+        edit = self.done.pop()
+        edit.revert()
+        self.undone.append(edit)
+        return edit
+    
+    def redo(self) -> Optional[Edit]:
+        if not self.undone:
+            return None
+        edit = self.undone.pop()
+        edit.apply()
+        self.done.append(edit)
+        return edit
@@ -0,0 +1,160 @@
+import csv
+import io
+import itertools
+import json
+import os
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from src.utils import get_category
+
+# (line or record number, parsed fields or None if unreadable, byte offset for progress)
+Record = Tuple[int, Optional[Dict[str, str]], int]
+Reader = Callable[[BinaryIO], Iterator[Record]]
+
+FIELDS = ('players', 'map', 'time', 'variable', 'video', 'description', 'category', 'platform')
+ALIASES = {
+    'player': 'players', 'runner': 'players', 'runners': 'players',
+    'level': 'map', 'level name': 'map',
+    'gear': 'variable', 'subcategory': 'variable',
+    'url': 'video', 'video url': 'video', 'link': 'video',
+    'comment': 'description', 'notes': 'description',
+}
+
+READERS = {}
+EXTENSIONS = {}
+
+def register(name: str, *extensions: str) -> Callable[[Reader], Reader]:
+    def wrap(reader: Reader) -> Reader:
+        READERS[name] = reader
+        for extension in extensions:
+            EXTENSIONS[extension] = name
+        return reader
+    return wrap
+
+def format_for(path: str) -> str:
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'pipe')
+
+def read_records(source: Union[str, BinaryIO], fmt: Optional[str] = None) -> Iterator[Record]:
+    if not isinstance(source, str):
+        yield from READERS[fmt or 'pipe'](source)
+        return
+    with open(source, 'rb') as f:
+        yield from READERS[fmt or format_for(source)](f)
+
+def _fields(values: Dict[str, object]) -> Dict[str, str]:
+    run_data = {}
+    for key, value in values.items():
+        key = str(key).strip().casefold()
+        key = ALIASES.get(key, key)
+        if key not in FIELDS or value is None:
+            continue
+        run_data[key] = ','.join(map(str, value)) if isinstance(value, list) else str(value).strip()
+    
+    for key in ('players', 'map', 'time', 'variable', 'video', 'description'):
+        run_data.setdefault(key, '')
+    run_data['category'] = run_data.get('category') or get_category(run_data['players'])
+    return run_data
+
+def iter_lines(f: BinaryIO) -> Iterator[Tuple[int, str, int]]:
+    position = 0
+    for line_num, raw in enumerate(f, 1):
+        position += len(raw)
+        line = raw.decode('utf-8', errors='replace').strip()
+        if line:
+            yield line_num, line, position
+
+def read_lines(path: str) -> Iterator[Tuple[int, str, int]]:
+    with open(path, 'rb') as f:
+        yield from iter_lines(f)
+
+def parse_line(line: str) -> Optional[Dict[str, str]]:
+    parts = [p.strip() for p in line.split('|')]
+    
+    if len(parts) < 5:
+        return None
+    
+    return {
+        'players': parts[0],
+        'map': parts[1],
+        'time': parts[2],
+        'variable': parts[3],
+        'video': parts[4],
+        'description': parts[5] if len(parts) > 5 else '',
+        'category': get_category(parts[0])
+    }
+
+@register('pipe', '.txt')
+def read_pipe(f: BinaryIO) -> Iterator[Record]:
+    for line_num, line, position in iter_lines(f):
+        yield line_num, parse_line(line), position
+
+@register('csv', '.csv', '.tsv')
+def read_csv(f: BinaryIO) -> Iterator[Record]:
+    text = io.TextIOWrapper(f, encoding='utf-8-sig', errors='replace', newline='')
+    # sniff from the first lines rather than seeking back, so piped input works too
+    head = list(itertools.islice(text, 20))
+    try:
+        dialect = csv.Sniffer().sniff(''.join(head), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    
+    # bytes are counted as lines are handed to the reader, tell() isn't available on a pipe
+    position = [0]
+    def lines() -> Iterator[str]:
+        for line in itertools.chain(head, text):
+            position[0] += len(line.encode('utf-8'))
+            yield line
+    
+    reader = csv.DictReader(lines(), dialect=dialect)
+    for row in reader:
+        if not any(row.values()):
+            continue
+        yield reader.line_num, _fields({k: v for k, v in row.items() if k is not None}), position[0]
+    text.detach()
+
+@register('jsonl', '.jsonl', '.ndjson', '.json')
+def read_jsonl(f: BinaryIO) -> Iterator[Record]:
+    for line_num, line, position in iter_lines(f):
+        try:
+            value = json.loads(line)
+        except ValueError:
+            value = None
+        yield line_num, _fields(value) if isinstance(value, dict) else None, position
+
+def _tag(elem: ET.Element) -> str:
+    return elem.tag.rsplit('}', 1)[-1]
+
+@register('livesplit', '.lss')
+def read_livesplit(f: BinaryIO) -> Iterator[Record]:
+    # a splits file describes one run, submitted with its personal best; the category names the map
+    values = {}
+    path = []
+    best = None
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            path.append(_tag(elem))
+            continue
+        
+        tag = path.pop()
+        parent = path[-1] if path else None
+        if tag == 'CategoryName' and parent == 'Run':
+            values['map'] = elem.text or ''
+        elif tag == 'Platform' and parent == 'Metadata':
+            values['platform'] = elem.text or ''
+        elif tag == 'Variable' and parent == 'Variables' and 'variable' not in values:
+            values['variable'] = elem.text or ''
+        elif tag == 'Variable' and parent == 'CustomVariables':
+            values[elem.get('name', '')] = elem.text or ''
+        elif tag == 'SplitTime' and elem.get('name') == 'Personal Best':
+            times = {_tag(child): child.text for child in elem}
+            best = times.get('RealTime') or times.get('GameTime')
+        elif tag == 'Segment':
+            # only the last segment's personal best is the full run time
+            values['time'] = best or ''
+            best = None
+        
+        if tag in ('Segment', 'Attempt', 'AttemptHistory'):
+            elem.clear()
+    
+    yield 1, _fields(values), f.tell() if f.seekable() else 0
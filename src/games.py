@@ -0,0 +1,100 @@
+import glob
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.api import API
+from src.config import CATEGORIES, PLATFORM_ID, VARIABLES
+from src.levels import LevelIndex, load_aliases
+from src.utils import data_dir
+
+def _subcategory(variables: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    # the import format has a single variable column, which maps to the game's subcategory variable
+    candidates = sorted(variables.items(), key=lambda item: (item[1]['id'] != VARIABLES['variable_id'], not item[1].get('subcategory')))
+    for name, variable in candidates:
+        if variable['id'] == VARIABLES['variable_id'] or variable.get('subcategory'):
+            return name, {'variable_id': variable['id'], 'options': dict(variable['values'])}
+    return None, {'variable_id': None, 'options': {}}
+
+class Game:
+    def __init__(self, game_id: str, data: Dict[str, Any]):
+        self.game_id = game_id
+        self.name = data.get('name') or game_id
+        self.categories = dict(data['categories'])
+        self.levels = dict(data['levels'])
+        self.platforms = dict(data.get('platforms') or {})
+        self.variable_name, self.variables = _subcategory(data.get('variables') or {})
+        self.index = LevelIndex(self.levels, {**data.get('level_aliases', {}), **load_aliases()})
+        
+        platform_ids = list(self.platforms.values())
+        self.platform_id = PLATFORM_ID if PLATFORM_ID in platform_ids or not platform_ids else platform_ids[0]
+        # used for lines whose category only comes from the player count, which most games don't name that way
+        self.default_category = None
+    
+    @classmethod
+    def placeholder(cls, game_id: str) -> 'Game':
+        # stands in for the game until its data is loaded, so the form has something to show
+        return cls(game_id, {
+            'categories': dict(CATEGORIES),
+            'levels': {},
+            'variables': {'Gear': {'id': VARIABLES['variable_id'], 'values': VARIABLES['options'], 'subcategory': True}},
+        })
+    
+    @property
+    def variable_options(self) -> Dict[str, Optional[str]]:
+        # games without a subcategory variable take an empty variable column
+        return self.variables['options'] or {'': None}
+    
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({self.game_id})" if self.name != self.game_id else self.game_id
+    
+    def platform(self, name: Optional[str]) -> Optional[str]:
+        if not name:
+            return self.platform_id
+        return self.platforms.get(name) or (name if name in self.platforms.values() else None)
+
+class GameRegistry:
+    def __init__(self, api: API):
+        self.api = api
+        self.games = {}
+        self.lock = threading.Lock()
+    
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.games
+    
+    def __getitem__(self, game_id: str) -> Game:
+        return self.games[game_id]
+    
+    def add(self, game_id: str, data: Dict[str, Any]) -> Game:
+        game = Game(game_id, data)
+        with self.lock:
+            self.games[game_id] = game
+        return game
+    
+    def cached(self, game_id: str) -> Tuple[Optional[Game], bool]:
+        if game_id in self.games:
+            return self.games[game_id], False
+        cache = self.api.game_cache(game_id)
+        entry = cache.load()
+        if entry is None:
+            return None, True
+        return self.add(game_id, entry['data']), cache.is_stale(entry)
+    
+    def get(self, game_id: str, refresh: bool = False) -> Game:
+        if not refresh and game_id in self.games:
+            return self.games[game_id]
+        return self.add(game_id, self.api.fetch_game_data(refresh, game_id))
+    
+    def known(self) -> List[str]:
+        ids = [self.api.game_id, *self.games]
+        for path in glob.glob(os.path.join(data_dir(), 'game_*.json')):
+            ids.append(os.path.basename(path)[len('game_'):-len('.json')])
+        return list(dict.fromkeys(ids))
+    
+    def label(self, game_id: str) -> str:
+        if game_id in self.games:
+            return self.games[game_id].label
+        entry = self.api.game_cache(game_id).load()
+        name = entry and entry['data'].get('name')
+        return f"{name} ({game_id})" if name else game_id
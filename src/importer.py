@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from queue import Queue, Full
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.formats import Record, parse_line, read_records
+from src.games import Game
+from src.levels import LevelIndex
+from src.models import Run
+from src.telemetry import Telemetry
+from src.utils import get_category
+from src.validation import error_message, validate_rows
+
+BATCH_SIZE = 500
+MAX_ERRORS = 10
+
+def resolve_map(run_data: Dict[str, str], index: LevelIndex) -> Optional[str]:
+    name, suggestions = index.match(run_data['map'])
+    if name:
+        run_data['map'] = name
+        return None
+    
+    hint = f", did you mean {' / '.join(suggestions)}?" if suggestions else ""
+    return f"Invalid map ({run_data['map']}){hint}"
+
+def check_rows(records: Sequence[Optional[Dict[str, str]]], game: Game) -> List[Tuple[Optional[Run], Optional[str]]]:
+    results = [(None, "Invalid format.")] * len(records)
+    rows = []
+    positions = []
+    for i, run_data in enumerate(records):
+        if not run_data:
+            continue
+        
+        error = resolve_map(run_data, game.index)
+        if error:
+            results[i] = (None, error)
+            continue
+        
+        category = run_data.get('category')
+        if game.default_category and category not in game.categories and category == get_category(run_data.get('players') or ''):
+            run_data['category'] = game.default_category
+        run_data['game_id'] = game.game_id
+        run_data['platform_id'] = game.platform(run_data.get('platform'))
+        if not run_data['platform_id']:
+            results[i] = (None, f"Invalid platform ({run_data['platform']})")
+            continue
+        rows.append(run_data)
+        positions.append(i)
+    
+    # time, players, variable and video are checked a whole column at a time
+    codes, times = validate_rows(rows, game.levels, game.variable_options, game.categories)
+    for i, run_data, code, time_obj in zip(positions, rows, codes, times):
+        if code:
+            results[i] = (None, error_message(code, run_data))
+        else:
+            results[i] = (Run.from_fields(run_data, game.categories, game.levels, game.variables, time_obj), None)
+    return results
+
+def check_lines(lines: Sequence[str], game: Game) -> List[Tuple[Optional[Run], Optional[str]]]:
+    return check_rows([parse_line(line) for line in lines], game)
+    
+def iter_checked(records: Iterable[Record], game: Game,
+                 batch_size: int = BATCH_SIZE) -> Iterator[Tuple[int, int, Optional[Run], Optional[str]]]:
+    chunk = []
+    for item in records:
+        chunk.append(item)
+        if len(chunk) >= batch_size:
+            yield from _checked(chunk, game)
+            chunk = []
+    if chunk:
+        yield from _checked(chunk, game)
+    
+def _checked(chunk: List[Record], game: Game) -> Iterator[Tuple[int, int, Optional[Run], Optional[str]]]:
+    results = check_rows([run_data for _, run_data, _ in chunk], game)
+    for (line_num, _, position), (run, error) in zip(chunk, results):
+        yield line_num, position, run, error
+
+class Importer:
+    def __init__(self, game: Game, batch_size: int = BATCH_SIZE, telemetry: Optional[Telemetry] = None):
+        self.game = game
+        self.batch_size = batch_size
+        self.events = Queue(maxsize=4)
+        self.cancelled = threading.Event()
+        self.telemetry = telemetry or Telemetry()
+    
+    def start(self, path: str):
+        self.cancelled.clear()
+        threading.Thread(target=self._run, args=(path,), daemon=True).start()
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def _put(self, event: Tuple):
+        while not self.cancelled.is_set():
+            try:
+                self.events.put(event, timeout=0.1)
+                return
+            except Full:
+                continue
+    
+    def _emit(self, batch: list, progress: float, started: float):
+        self.telemetry.observe('import_batch_seconds', time.perf_counter() - started)
+        self.telemetry.inc('import_runs_total', len(batch))
+        # time spent blocked here means the UI is draining batches slower than they are parsed
+        with self.telemetry.timer('import_backpressure_seconds'):
+            self._put(('runs', batch, progress))
+        self.telemetry.set('import_queue_depth', self.events.qsize())
+    
+    def _run(self, path: str):
+        errors = []
+        error_count = 0
+        batch = []
+        started = time.perf_counter()
+        
+        try:
+            size = os.path.getsize(path) or 1
+            for line_num, position, run, error in iter_checked(read_records(path), self.game, self.batch_size):
+                if self.cancelled.is_set():
+                    break
+                
+                if error:
+                    error_count += 1
+                    self.telemetry.inc('import_errors_total')
+                    if len(errors) < MAX_ERRORS:
+                        errors.append(f"Line {line_num}: {error}")
+                    continue
+                
+                batch.append(run)
+                if len(batch) >= self.batch_size:
+                    self._emit(batch, position / size, started)
+                    batch = []
+                    started = time.perf_counter()
+            
+            if batch:
+                self._emit(batch, 1.0, started)
+        except Exception as e:
+            error_count += 1
+            errors.append(f"Import failed: {str(e)}")
+        
+        self.events.put(('done', errors, error_count))
@@ -0,0 +1,91 @@
+import json
+import os
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from src.utils import data_dir
+
+MEMO_SIZE = 10000
+CANDIDATES = 20
+
+def normalize(name: str) -> str:
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name.casefold()).split())
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def load_aliases(path: Optional[str] = None) -> Dict[str, str]:
+    try:
+        with open(path or os.path.join(data_dir(), 'aliases.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+class LevelIndex:
+    def __init__(self, levels: Dict[str, str], aliases: Optional[Dict[str, str]] = None):
+        self.levels = levels
+        self.keys = {}
+        self.grams = defaultdict(set)
+        self.sizes = {}
+        self.memo = {}
+        
+        for name in levels:
+            self._add(name, name)
+        for alias, name in (aliases or {}).items():
+            if name in levels:
+                self._add(alias, name)
+    
+    def _add(self, key: str, name: str):
+        key = normalize(key)
+        if not key or key in self.keys:
+            return
+        self.keys[key] = name
+        grams = trigrams(key)
+        self.sizes[key] = len(grams)
+        for gram in grams:
+            self.grams[gram].add(key)
+    
+    def resolve(self, name: str) -> Optional[str]:
+        if name in self.levels:
+            return name
+        return self.keys.get(normalize(name))
+    
+    def suggest(self, name: str, limit: int = 3, cutoff: float = 0.6) -> List[str]:
+        key = normalize(name)
+        if key in self.memo:
+            return self.memo[key]
+        
+        grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] += 1
+        
+        # trigram overlap narrows thousands of levels down to a few candidates worth a proper comparison
+        # ties are broken by name, set order changes with string hashing from one run to the next
+        candidates = sorted(shared, key=lambda c: (-2 * shared[c] / (len(grams) + self.sizes[c]), c))[:CANDIDATES]
+        scored = []
+        for candidate in candidates:
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score >= cutoff:
+                scored.append((score, self.keys[candidate]))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        
+        suggestions = []
+        for _, level in scored:
+            if level not in suggestions:
+                suggestions.append(level)
+            if len(suggestions) == limit:
+                break
+        
+        if len(self.memo) >= MEMO_SIZE:
+            self.memo.clear()
+        self.memo[key] = suggestions
+        return suggestions
+    
+    def match(self, name: str) -> Tuple[Optional[str], List[str]]:
+        resolved = self.resolve(name)
+        return (resolved, []) if resolved else (None, self.suggest(name))
@@ -0,0 +1,86 @@
+import sys
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Tuple
+
+from src.utils import parse_time
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+def split_players(players: str) -> Tuple[str, ...]:
+    return tuple(sys.intern(p.strip()) for p in players.split(',') if p.strip())
+
+@dataclass(slots=True, eq=False)
+class Run:
+    category: str
+    category_id: Optional[str]
+    level: str
+    level_id: Optional[str]
+    variable: str
+    variable_id: Optional[str]
+    variable_value_id: Optional[str]
+    players: Tuple[str, ...]
+    time: str
+    time_obj: Tuple[int, int, int]
+    video: str
+    description: str
+    game_id: Optional[str] = None
+    platform_id: Optional[str] = None
+    queue_id: Optional[int] = None
+    
+    @classmethod
+    def from_fields(cls, fields: Dict[str, str], categories: Dict, levels: Dict, vars: Dict,
+                    time_obj: Optional[Tuple[int, int, int]] = None) -> 'Run':
+        category = fields.get('category') or ''
+        level = fields.get('map', '')
+        variable = fields.get('variable', '')
+        time = fields.get('time', '').strip()
+        if time_obj is None:
+            parsed = parse_time(time)
+            time_obj = (parsed['minute'], parsed['second'], parsed['millisecond'])
+        
+        return cls(
+            category=_intern(category),
+            category_id=_intern(categories.get(category)),
+            level=_intern(level),
+            level_id=_intern(levels.get(level)),
+            variable=_intern(variable),
+            variable_id=_intern(vars.get('variable_id')) if variable else None,
+            variable_value_id=_intern(vars.get('options', {}).get(variable)) if variable else None,
+            players=split_players(fields.get('players', '')),
+            time=time,
+            time_obj=time_obj,
+            video=fields.get('video', ''),
+            description=fields.get('description', ''),
+            game_id=_intern(fields.get('game_id')),
+            platform_id=_intern(fields.get('platform_id')),
+        )
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Run':
+        data = dict(data)
+        if isinstance(data['players'], str):
+            data['players'] = split_players(data['players'])
+        if 'time_obj' not in data:
+            parsed = parse_time(data['time'])
+            data['time_obj'] = (parsed['minute'], parsed['second'], parsed['millisecond'])
+        
+        for key in ('category', 'category_id', 'level', 'level_id', 'variable', 'variable_id', 'variable_value_id',
+                    'game_id', 'platform_id'):
+            data[key] = _intern(data.get(key))
+        data['players'] = tuple(sys.intern(p) for p in data['players'])
+        data['time_obj'] = tuple(data['time_obj'])
+        return cls(**data)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data['queue_id']
+        return data
+    
+    @property
+    def players_text(self) -> str:
+        return ', '.join(self.players)
+    
+    def time_dict(self) -> Dict[str, int]:
+        minute, second, millisecond = self.time_obj
+        return {'minute': minute, 'second': second, 'millisecond': millisecond}
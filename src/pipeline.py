@@ -0,0 +1,80 @@
+import os
+import threading
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+
+from src.dedupe import fingerprint
+from src.games import Game
+from src.formats import read_records
+from src.importer import BATCH_SIZE, MAX_ERRORS, iter_checked
+from src.models import Run
+from src.store import QueueStore
+from src.submitter import Submitter
+
+class Pipeline:
+    def __init__(self, game: Game, submitter: Submitter, store: Optional[QueueStore] = None,
+                 batch_size: int = BATCH_SIZE, fmt: Optional[str] = None, on_invalid: Optional[Callable[[int, str], None]] = None,
+                 track_lines: bool = False):
+        self.game = game
+        self.submitter = submitter
+        self.store = store
+        self.batch_size = batch_size
+        self.fmt = fmt
+        self.on_invalid = on_invalid
+        self.track_lines = track_lines
+        self.cancelled = threading.Event()
+        self.errors = []
+        self.error_count = 0
+        self.duplicates = 0
+        self.progress = 0.0
+        self.lines = {}
+    
+    def start(self, source: Union[str, BinaryIO]):
+        self.cancelled.clear()
+        self.submitter.stream(self._runs(source))
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def _invalid(self, line_num: int, error: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"Line {line_num}: {error}")
+        if self.on_invalid:
+            self.on_invalid(line_num, error)
+    
+    def _runs(self, source: Union[str, BinaryIO]) -> Iterator[Run]:
+        # runs on the submitter's thread, which only asks for the next run once a worker slot frees up
+        seen = set()
+        try:
+            size = os.path.getsize(source) or 1 if isinstance(source, str) else 0
+            records = read_records(source, self.fmt)
+            for line_num, position, run, error in iter_checked(records, self.game, self.batch_size):
+                if self.cancelled.is_set():
+                    return
+                
+                if size:
+                    self.progress = position / size
+                if error:
+                    self._invalid(line_num, error)
+                    continue
+                
+                fp = fingerprint(run)
+                if fp in seen:
+                    self.duplicates += 1
+                    if self.on_invalid:
+                        self.on_invalid(line_num, "Duplicate of an earlier line")
+                    continue
+                seen.add(fp)
+                
+                if self.store is not None:
+                    self.store.add(run)
+                if self.track_lines:
+                    self.lines[id(run)] = line_num
+                yield run
+        except Exception as e:
+            self.error_count += 1
+            self.errors.append(f"Import failed: {str(e)}")
+        self.progress = 1.0
+    
+    def line_of(self, run: Run) -> Optional[int]:
+        return self.lines.pop(id(run), None)
@@ -0,0 +1,92 @@
+import glob
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+from src.api import API
+from src.models import Run
+from src.session import Session
+from src.utils import data_dir
+
+if TYPE_CHECKING:
+    from src.client import Client
+
+def account_path(username: str) -> str:
+    return os.path.join(data_dir(), f"session_{re.sub(r'[^A-Za-z0-9_-]', '_', username)}.json")
+
+class AccountPool:
+    def __init__(self, sessions: List[Session]):
+        self.sessions = []
+        self.in_flight = {}
+        self.telemetry = sessions[0].api.telemetry
+        self.lock = threading.Lock()
+        for session in sessions:
+            self.add(session)
+    
+    def __len__(self) -> int:
+        return len(self.active())
+    
+    def add(self, session: Session):
+        session.api.telemetry = self.telemetry
+        with self.lock:
+            self.sessions = [s for s in self.sessions if s.username is None or s.username != session.username] + [session]
+            self.in_flight[id(session)] = 0
+    
+    def remove(self, session: Session):
+        with self.lock:
+            self.sessions = [s for s in self.sessions if s is not session]
+    
+    def active(self) -> List[Session]:
+        return [s for s in self.sessions if s.logged_in]
+    
+    def restore(self, game_id: str, rate: float, client: Optional[Callable[[], 'Client']] = None) -> List[Session]:
+        restored = []
+        for path in sorted(glob.glob(os.path.join(data_dir(), 'session_*.json'))):
+            session = Session(API(game_id, rate, client=client and client()), path=path)
+            if session.restore() is not None:
+                self.add(session)
+                restored.append(session)
+        return restored
+    
+    def _pick(self, tried: set) -> Optional[Session]:
+        # least loaded account relative to how fast its rate limiter currently lets it go
+        with self.lock:
+            candidates = [s for s in self.sessions if s.logged_in and id(s) not in tried]
+            if not candidates:
+                return None
+            session = min(candidates, key=lambda s: (self.in_flight[id(s)] + 1) / s.api.limiter.rate)
+            self.in_flight[id(session)] += 1
+            return session
+    
+    def _release(self, session: Session):
+        with self.lock:
+            self.in_flight[id(session)] -= 1
+    
+    def submit_run(self, run: Run) -> Any:
+        from speedruncompy.exceptions import AuthException, RateLimitExceeded, Unauthorized
+        # raised once API.submit_run has already tried a fresh csrf token, so the account itself is logged out
+        expired = (AuthException, Unauthorized)
+        
+        tried = set()
+        error = None
+        while True:
+            session = self._pick(tried)
+            if session is None:
+                raise error or AuthException("No logged in accounts to submit with")
+            
+            try:
+                result = session.api.submit_run(run)
+            except expired as e:
+                session.api.csrf_token = None
+                self.telemetry.inc('account_failovers_total', account=session.username, reason='expired')
+                error = e
+            except RateLimitExceeded as e:
+                self.telemetry.inc('account_failovers_total', account=session.username, reason='throttled')
+                error = e
+            else:
+                self.telemetry.inc('account_runs_total', account=session.username)
+                return result
+            finally:
+                self._release(session)
+            tried.add(id(session))
@@ -0,0 +1,118 @@
+from tkinter import ttk
+from typing import List, Tuple
+
+from src.models import Run
+
+COLUMNS = ("Category", "Map", "Gear", "Players", "Time")
+COLUMN_WIDTHS = {"Category": 70, "Map": 90, "Gear": 60, "Players": 100, "Time": 60}
+# Shift and Control bits of a Tk event's state
+EXTEND_MASK = 0x0001 | 0x0004
+
+def row_values(run: Run) -> Tuple:
+    return (run.category, run.level, run.variable, run.players_text, run.time)
+
+def _key(run: Run) -> int:
+    # queued runs are keyed by their store row, which survives edits and re-reads of the same run
+    return run.queue_id if run.queue_id is not None else id(run)
+
+class QueueView:
+    def __init__(self, parent, runs: List[Run], height: int = 15):
+        self.frame = ttk.Frame(parent)
+        self.runs = runs
+        self.height = height
+        self.offset = 0
+        self.selected = set()
+        
+        self.tree = ttk.Treeview(self.frame, columns=COLUMNS, show="headings", height=height, selectmode="extended")
+        for col in COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=COLUMN_WIDTHS[col], stretch=True)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<ButtonPress-1>', self._on_click)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Up>', lambda e: self._on_arrow(e, -1))
+        self.tree.bind('<Down>', lambda e: self._on_arrow(e, 1))
+    
+    def _visible(self) -> List[Run]:
+        return self.runs[self.offset:self.offset + self.height]
+    
+    def refresh(self):
+        total = len(self.runs)
+        self.offset = max(0, min(self.offset, total - self.height))
+        visible = self._visible()
+        rows = self.tree.get_children()
+        
+        if len(rows) > len(visible):
+            self.tree.delete(*rows[len(visible):])
+        for i, run in enumerate(visible):
+            if i < len(rows):
+                self.tree.item(rows[i], values=row_values(run))
+            else:
+                self.tree.insert('', 'end', iid=f"row{i}", values=row_values(run))
+        
+        self.tree.selection_set([f"row{i}" for i, run in enumerate(visible) if _key(run) in self.selected])
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.height) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def refresh_rows(self, runs: List[Run]):
+        # only rows on screen exist, so an edit touching thousands of runs redraws at most a page
+        rows = {id(run): i for i, run in enumerate(self._visible())}
+        for run in runs:
+            i = rows.get(id(run))
+            if i is not None:
+                self.tree.item(f"row{i}", values=row_values(run))
+    
+    def scroll(self, rows: int):
+        self.offset += rows
+        self.refresh()
+    
+    def _on_scrollbar(self, action: str, amount: str, unit: str = 'units'):
+        if action == 'moveto':
+            self.offset = int(float(amount) * len(self.runs))
+            self.refresh()
+        else:
+            self.scroll(int(amount) * (self.height if unit == 'pages' else 1))
+    
+    def _on_arrow(self, event, step: int):
+        focus = self.tree.focus()
+        index = self.tree.index(focus) if focus else -1
+        if (step < 0 and index == 0) or (step > 0 and index == len(self.tree.get_children()) - 1):
+            self.scroll(step)
+            return "break"
+        # like a plain click, a plain arrow key moves the selection to the next row
+        if not event.state & EXTEND_MASK:
+            self.selected.clear()
+    
+    def _on_click(self, event):
+        # a plain click replaces the selection, including runs scrolled out of view
+        if not event.state & EXTEND_MASK and self.tree.identify_region(event.x, event.y) in ('cell', 'tree'):
+            self.selected.clear()
+    
+    def _on_select(self, event=None):
+        visible = self._visible()
+        rows = set(self.tree.selection())
+        for i, run in enumerate(visible):
+            if f"row{i}" in rows:
+                self.selected.add(_key(run))
+            else:
+                self.selected.discard(_key(run))
+    
+    def selected_runs(self) -> List[Run]:
+        return [run for run in self.runs if _key(run) in self.selected]
+    
+    def forget(self, runs: List[Run]):
+        for run in runs:
+            self.selected.discard(_key(run))
+    
+    def select(self, runs: List[Run]):
+        self.selected = {_key(run) for run in runs}
+        self.refresh()
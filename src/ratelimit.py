@@ -0,0 +1,78 @@
+import random
+import threading
+import time
+from typing import Optional
+
+
+# throttles answered within this long of a slowdown are the same episode, from requests sent before it
+EPISODE = 1.0
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.2, max_rate: float = 10.0,
+                 increase: float = 0.05, decrease: float = 0.5, episode: float = EPISODE):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.episode = episode
+        self.episode_until = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.episode_until:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.episode_until = now + max(self.episode, retry_after or 0)
+            self.tokens = 0.0
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+
+class RetryBudget:
+    # retries may make up at most `ratio` of requests, plus a small floor for quiet periods
+    def __init__(self, ratio: float = 0.2, floor: int = 10):
+        self.ratio = ratio
+        self.balance = float(floor)
+        self.limit = float(floor) * 2
+        self.lock = threading.Lock()
+    
+    def deposit(self):
+        with self.lock:
+            self.balance = min(self.limit, self.balance + self.ratio)
+    
+    def withdraw(self) -> bool:
+        with self.lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+def backoff(attempt: int, base: float = 0.5, cap: float = 30.0, retry_after: Optional[float] = None) -> float:
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after or 0)
@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.api import API
+from src.models import Run
+
+CACHE_TTL = 600
+FETCH_WORKERS = 4
+
+# (game, category, level) identifies one leaderboard
+Board = Tuple[str, str, Optional[str]]
+# (sorted casefolded player names, time in milliseconds)
+Key = Tuple[str, int]
+
+def _players(names: Iterable[str]) -> str:
+    return ','.join(sorted(name.casefold() for name in names))
+
+def _millis(run: Run) -> int:
+    minute, second, millisecond = run.time_obj
+    return (minute * 60 + second) * 1000 + millisecond
+
+class Reconciler:
+    def __init__(self, api: API, ttl: float = CACHE_TTL):
+        self.api = api
+        self.ttl = ttl
+        self.boards = {}
+        self.lock = threading.Lock()
+        self.telemetry = api.telemetry
+    
+    def board(self, run: Run) -> Board:
+        return run.game_id or self.api.game_id, run.category_id, run.level_id
+    
+    def key(self, run: Run) -> Key:
+        return _players(run.players), _millis(run)
+    
+    def _fetch(self, board: Board) -> Optional[Dict[Key, List[Tuple[frozenset, str]]]]:
+        from speedruncompy.datatypes.enums import VerifiedFilter
+        
+        index = {}
+        try:
+            # pending runs are the ones moderators would have to reject by hand
+            for verified in (VerifiedFilter.VERIFIED, VerifiedFilter.AWAITING):
+                runs, players = self.api.leaderboard_runs(*board, verified)
+                for entry in runs:
+                    seconds = entry.get('time') or entry.get('igt')
+                    if seconds is None:
+                        continue
+                    names = [players.get(player_id, player_id) for player_id in entry.get('playerIds') or []]
+                    key = (_players(names), round(seconds * 1000))
+                    index.setdefault(key, []).append((frozenset(entry.get('valueIds') or ()), entry['id']))
+            self.telemetry.inc('reconcile_boards_total')
+        except Exception as e:
+            # an unreachable leaderboard shouldn't block submitting, the ledger still catches our own repeats;
+            # nothing is cached, so the next lookup tries the board again
+            self.telemetry.inc('reconcile_errors_total', error=type(e).__name__)
+            return None
+        return index
+    
+    def _stale(self, board: Board) -> bool:
+        entry = self.boards.get(board)
+        return entry is None or time.monotonic() - entry[0] > self.ttl
+    
+    def _store(self, board: Board, index: Dict[Key, List[Tuple[frozenset, str]]]):
+        with self.lock:
+            self.boards[board] = (time.monotonic(), index)
+    
+    def prefetch(self, runs: Iterable[Run]):
+        boards = {self.board(run) for run in runs if run.category_id}
+        missing = [board for board in boards if self._stale(board)]
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for board, index in zip(missing, executor.map(self._fetch, missing)):
+                if index is not None:
+                    self._store(board, index)
+    
+    def match(self, run: Run) -> Optional[str]:
+        if not run.category_id:
+            return None
+        board = self.board(run)
+        if self._stale(board):
+            index = self._fetch(board)
+            if index is None:
+                return None
+            self._store(board, index)
+        
+        with self.lock:
+            index = self.boards[board][1]
+        for values, run_id in index.get(self.key(run), ()):
+            if not run.variable_value_id or run.variable_value_id in values:
+                self.telemetry.inc('reconcile_matches_total')
+                return run_id
+        return None
+    
+    def add(self, run: Run, run_id: Optional[str]):
+        board = self.board(run)
+        with self.lock:
+            if board in self.boards:
+                values = frozenset((run.variable_value_id,)) if run.variable_value_id else frozenset()
+                self.boards[board][1].setdefault(self.key(run), []).append((values, run_id))
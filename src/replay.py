@@ -0,0 +1,124 @@
+import asyncio
+import atexit
+import gzip
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from src.client import Client
+
+# never written to a log, a recording is meant to be shared when reporting a failed batch
+REDACTED = ('password', 'token', 'csrfToken')
+# requests a dry run answers itself instead of sending
+WRITES = ('PutRunSettings',)
+
+def _open(path: str, mode: str) -> IO:
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def _redact(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: "***" if key in REDACTED and value else value for key, value in params.items()}
+
+def _scrub(value: Any) -> Any:
+    # responses carry secrets too, e.g. GetSession's csrfToken, wherever they sit in the body
+    if isinstance(value, dict):
+        return {key: "***" if key in REDACTED and item else _scrub(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_scrub(item) for item in value]
+    return value
+
+def _redact_body(body: bytes) -> str:
+    text = body.decode('utf-8', errors='replace')
+    try:
+        return json.dumps(_scrub(json.loads(text)), separators=(',', ':'))
+    except ValueError:
+        return text
+
+def load(path: str) -> List[Dict[str, Any]]:
+    with _open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class Recorder:
+    def __init__(self, path: str):
+        self.path = path
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        # session cookies end up in recorded responses, so the log is private like session.json
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
+        self.file = _open(path, 'a')
+        # a gzip log is unreadable without its trailer, which is only written on close
+        atexit.register(self.close)
+    
+    def write(self, method: str, endpoint: str, params: Dict[str, Any], body: bytes, status: int,
+              seconds: float, retry_after: Optional[str] = None):
+        entry = {
+            't': round(time.monotonic() - self.started, 4),
+            'method': method,
+            'endpoint': endpoint,
+            'params': _redact(params),
+            'status': status,
+            'seconds': round(seconds, 4),
+            'retry_after': retry_after,
+            'body': _redact_body(body),
+        }
+        line = json.dumps(entry, separators=(',', ':'), default=str) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+    
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+class ReplayClient(Client):
+    def __init__(self, path: str, speed: float = 1.0, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.speed = speed
+        self.entries = {}
+        self.cursors = {}
+        self.lock = threading.Lock()
+        for entry in load(path):
+            self.entries.setdefault(entry['endpoint'], []).append(entry)
+    
+    def _next(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        entries = self.entries.get(endpoint)
+        if not entries:
+            return None
+        with self.lock:
+            if endpoint not in self.cursors:
+                # responses are handed out in recorded order and then reused, so a short log can drive a big batch
+                self.cursors[endpoint] = itertools.cycle(entries)
+            return next(self.cursors[endpoint])
+    
+    async def _transport(self, method: str, endpoint: str, params: dict) -> Tuple[bytes, int]:
+        entry = self._next(endpoint)
+        if entry is None:
+            self.last_response.retry_after = None
+            return json.dumps({'error': f"{endpoint} is not in the replay log"}).encode(), 404
+        
+        # speed 1 keeps each request's recorded latency, 2 halves it, 0 answers at once
+        if self.speed:
+            await asyncio.sleep(entry['seconds'] / self.speed)
+        self.last_response.retry_after = entry.get('retry_after')
+        return entry['body'].encode('utf-8'), entry['status']
+
+class DryRunClient(Client):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+        self.run_ids = itertools.count(1)
+        self.lock = threading.Lock()
+    
+    async def _transport(self, method: str, endpoint: str, params: dict) -> Tuple[bytes, int]:
+        if endpoint not in WRITES:
+            return await super()._transport(method, endpoint, params)
+        
+        with self.lock:
+            run_id = f"dry-run-{next(self.run_ids)}"
+            self.sent.append(_redact(params))
+        self.last_response.retry_after = None
+        return json.dumps({'runId': run_id, 'dryRun': _redact(params)}, default=str).encode(), 200
@@ -0,0 +1,80 @@
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+from src.api import API
+from src.utils import data_dir
+
+class Session:
+    def __init__(self, api: API, workers: int = 3, path: Optional[str] = None):
+        self.api = api
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.path = path or os.path.join(data_dir(), 'session.json')
+        self.username = None
+    
+    def _login(self, username: str, password: str, token: Optional[str]) -> Any:
+        result = self.api.login(username, password, token)
+        if result.get('loggedIn'):
+            self.api.get_csrf_token()
+            self.username = username
+            self.save()
+        return result
+    
+    def login(self, username: str, password: str, token: Optional[str] = None) -> Future:
+        return self.executor.submit(self._login, username, password, token)
+    
+    def fetch_game_data(self, refresh: bool = False, game_id: Optional[str] = None) -> Future:
+        return self.executor.submit(self.api.fetch_game_data, refresh, game_id)
+    
+    @property
+    def logged_in(self) -> bool:
+        return self.api.csrf_token is not None
+
+    def save(self):
+        data = {'username': self.username, 'phpsessid': self.api.session_id, 'csrf_token': self.api.csrf_token}
+        tmp = self.path + '.tmp'
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+    
+    def restore(self) -> Optional[str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not data.get('phpsessid') or not data.get('csrf_token'):
+            return None
+        
+        self.api.session_id = data['phpsessid']
+        self.api.csrf_token = data['csrf_token']
+        self.username = data.get('username')
+        return self.username
+    
+    def _validate(self) -> Optional[bool]:
+        from speedruncompy.exceptions import AuthException, Forbidden, Unauthorized
+        
+        try:
+            self.api.get_csrf_token()
+        except (AuthException, Unauthorized, Forbidden):
+            self.forget()
+            return False
+        except Exception:
+            # offline or speedrun.com is down, the saved session may well still be good
+            return None
+        self.save()
+        return True
+    
+    def validate(self) -> Future:
+        return self.executor.submit(self._validate)
+    
+    def forget(self):
+        self.api.csrf_token = None
+        self.username = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
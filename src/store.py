@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Set
+
+from src.models import Run
+from src.utils import data_dir
+
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+SUBMITTED = 'submitted'
+FAILED = 'failed'
+
+FLUSH_INTERVAL = 0.5
+FLUSH_BATCH = 100
+KEEP_SUBMITTED = 30 * 24 * 60 * 60
+
+class QueueStore:
+    def __init__(self, path: Optional[str] = None, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path or os.path.join(data_dir(), 'queue.sqlite3')
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            state TEXT NOT NULL,
+            response TEXT,
+            updated_at REAL NOT NULL
+        )""")
+        self.db.execute("DELETE FROM runs WHERE state = ? AND updated_at < ?", (SUBMITTED, time.time() - KEEP_SUBMITTED))
+        self.db.commit()
+        
+        self.next_id = (self.db.execute("SELECT MAX(id) FROM runs").fetchone()[0] or 0) + 1
+        self.ops = []
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True).start()
+    
+    def _flush_loop(self, interval: float):
+        while not self.closed.wait(interval):
+            self.flush()
+    
+    def _queue_op(self, sql: str, rows: List[tuple]):
+        with self.lock:
+            # submitter workers can still finish runs while the window closes, their writes are dropped
+            if self.closed.is_set():
+                return
+            self.ops.append((sql, rows))
+            self.pending += len(rows)
+            if self.pending < FLUSH_BATCH:
+                return
+        self.flush()
+    
+    def flush(self):
+        with self.lock:
+            ops, self.ops = self.ops, []
+            self.pending = 0
+            if not ops:
+                return
+            with self.db:
+                for sql, rows in ops:
+                    self.db.executemany(sql, rows)
+    
+    def add(self, run: Run) -> int:
+        with self.lock:
+            run_id = self.next_id
+            self.next_id += 1
+        run.queue_id = run_id
+        data = json.dumps(run.to_dict())
+        self._queue_op("INSERT INTO runs (id, data, state, updated_at) VALUES (?, ?, ?, ?)", [(run_id, data, QUEUED, time.time())])
+        return run_id
+    
+    def set_state(self, run_id: int, state: str, response: Any = None):
+        self._queue_op("UPDATE runs SET state = ?, response = ?, updated_at = ? WHERE id = ?",
+                       [(state, None if response is None else json.dumps(response, default=str), time.time(), run_id)])
+    
+    def update(self, *runs: Run):
+        self._queue_op("UPDATE runs SET data = ?, updated_at = ? WHERE id = ?",
+                       [(json.dumps(run.to_dict()), time.time(), run.queue_id) for run in runs if run.queue_id is not None])
+    
+    def remove(self, *run_ids: int):
+        self._queue_op("DELETE FROM runs WHERE id = ?", [(run_id,) for run_id in run_ids])
+    
+    def in_flight(self) -> Set[int]:
+        self.flush()
+        with self.lock:
+            return {row[0] for row in self.db.execute("SELECT id FROM runs WHERE state = ?", (IN_FLIGHT,))}
+    
+    def unfinished(self) -> List[Run]:
+        self.flush()
+        with self.lock:
+            rows = self.db.execute("SELECT id, data FROM runs WHERE state != ? ORDER BY id", (SUBMITTED,)).fetchall()
+        
+        runs = []
+        for run_id, data in rows:
+            run = Run.from_dict(json.loads(data))
+            run.queue_id = run_id
+            runs.append(run)
+        return runs
+    
+    def close(self):
+        self.closed.set()
+        self.flush()
+        with self.lock:
+            self.db.close()
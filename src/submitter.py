@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
+from typing import Any, Iterable, List, Optional, Tuple
+
+from src.dedupe import Ledger, fingerprint
+from src.models import Run
+from src.pool import AccountPool
+from src.reconcile import Reconciler
+from src.store import QueueStore, IN_FLIGHT, SUBMITTED, FAILED
+
+
+class Submitter:
+    def __init__(self, pool: AccountPool, workers: int = 4, ledger: Optional[Ledger] = None,
+                 store: Optional[QueueStore] = None, reconciler: Optional[Reconciler] = None):
+        self.pool = pool
+        self.workers = workers
+        self.ledger = ledger
+        self.store = store
+        self.reconciler = reconciler
+        self.events = Queue()
+        self.running = False
+        self.telemetry = pool.telemetry
+        self.remaining = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def start(self, runs: List[Run]):
+        self.stream(list(runs))
+    
+    def stream(self, runs: Iterable[Run]):
+        self.running = True
+        threading.Thread(target=self._run, args=(runs,), daemon=True).start()
+
+    def _record(self, run: Run, state: str, response: Any = None):
+        if self.store is not None and run.queue_id is not None:
+            self.store.set_state(run.queue_id, state, response)
+    
+    def _count(self, remaining: int = 0, in_flight: int = 0):
+        with self.lock:
+            self.remaining += remaining
+            self.in_flight += in_flight
+            self.telemetry.set('queue_depth', self.remaining)
+            self.telemetry.set('in_flight', self.in_flight)
+    
+    def _submit(self, run: Run) -> Any:
+        self._record(run, IN_FLIGHT)
+        self._count(in_flight=1)
+        try:
+            with self.telemetry.timer('submit_seconds'):
+                result = self.pool.submit_run(run)
+        finally:
+            self._count(remaining=-1, in_flight=-1)
+        if self.ledger is not None:
+            self.ledger.record(fingerprint(run), result.get('runId'))
+        if self.reconciler is not None:
+            self.reconciler.add(run, result.get('runId'))
+        self._record(run, SUBMITTED, {'runId': result.get('runId')})
+        return result
+
+    def _finish(self, future: Future, run: Run, slots: threading.Semaphore):
+        slots.release()
+        try:
+            self.events.put(('submitted', run, future.result()))
+            self.telemetry.inc('runs_total', status='submitted')
+        except Exception as e:
+            self._fail(run, e)
+    
+    def _fail(self, run: Run, e: Exception):
+        self._record(run, FAILED, {'error': f"{type(e).__name__}: {e}"})
+        self.telemetry.inc('runs_total', status='failed')
+        self.telemetry.inc('run_errors_total', error=type(e).__name__)
+        self.events.put(('failed', run, e))
+        
+    def _existing(self, run: Run) -> Tuple[bool, Optional[str]]:
+        fp = fingerprint(run)
+        if self.ledger is not None and fp in self.ledger:
+            return True, self.ledger.get(fp)
+        if self.reconciler is not None:
+            run_id = self.reconciler.match(run)
+            if run_id is not None:
+                # found on the leaderboard but not in the ledger, e.g. submitted from another machine
+                if self.ledger is not None:
+                    self.ledger.record(fp, run_id)
+                return True, run_id
+        return False, None
+    
+    def _run(self, runs: Iterable[Run]):
+        # workers are per account, so more accounts means more runs in flight
+        workers = self.workers * max(1, len(self.pool))
+        # runs are pulled from the iterable only as slots free up, which keeps streamed imports bounded
+        slots = threading.Semaphore(workers * 2)
+        batch = runs if isinstance(runs, list) else None
+        runs = iter(runs)
+        current = None
+        try:
+            if self.reconciler is not None and batch is not None:
+                # a known batch fetches every leaderboard it touches up front, streamed runs fetch on first use
+                self.reconciler.prefetch(batch)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for run in runs:
+                    current = run
+                    exists, run_id = self._existing(run)
+                    if exists:
+                        self._record(run, SUBMITTED, {'runId': run_id})
+                        self.telemetry.inc('runs_total', status='duplicate')
+                        self.events.put(('duplicate', run, run_id))
+                        current = None
+                        continue
+
+                    slots.acquire()
+                    self._count(remaining=1)
+                    future = executor.submit(self._submit, run)
+                    future.add_done_callback(lambda f, run=run: self._finish(f, run, slots))
+                    current = None
+        except Exception as e:
+            # every run that wasn't handed to a worker is reported, not silently dropped
+            unprocessed = [current] if current is not None else []
+            try:
+                unprocessed.extend(runs)
+            except Exception:
+                pass
+            for run in unprocessed:
+                self._fail(run, e)
+        finally:
+            self.running = False
+            self.events.put(('done', None, None))
@@ -0,0 +1,202 @@
+import bisect
+import csv
+import io
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RATE_WINDOW = 10.0
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _key(name: str, labels: Dict[str, Any]) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _labels(key: Key) -> str:
+    return ','.join(f'{k}="{v}"' for k, v in key[1])
+
+def _series(name: str, labels: str) -> str:
+    return f"{name}{{{labels}}}" if labels else name
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...] = BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else float('inf')
+        return float('inf')
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.bounds] + ['+Inf'], self.counts)),
+        }
+
+class Telemetry:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.events = {}
+        self.started = time.time()
+        self.lock = threading.Lock()
+    
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _key(name, labels)
+        now = time.monotonic()
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+            events = self.events.setdefault(key, deque())
+            events.append((now, amount))
+            while events[0][0] < now - RATE_WINDOW:
+                events.popleft()
+    
+    def set(self, name: str, value: float, **labels):
+        with self.lock:
+            self.gauges[_key(name, labels)] = value
+    
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+    
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def rate(self, name: str, **labels) -> float:
+        # per-second rate over the last RATE_WINDOW seconds
+        key = _key(name, labels)
+        cutoff = time.monotonic() - RATE_WINDOW
+        with self.lock:
+            events = self.events.get(key)
+            if not events:
+                return 0.0
+            while events and events[0][0] < cutoff:
+                events.popleft()
+            return sum(amount for _, amount in events) / RATE_WINDOW
+    
+    def counter(self, name: str, **labels) -> float:
+        with self.lock:
+            return self.counters.get(_key(name, labels), 0)
+    
+    def gauge(self, name: str, **labels) -> float:
+        with self.lock:
+            return self.gauges.get(_key(name, labels), 0)
+    
+    def total(self, name: str) -> float:
+        with self.lock:
+            return sum(value for key, value in self.counters.items() if key[0] == name)
+    
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.events.clear()
+            self.started = time.time()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'started': self.started,
+                'elapsed': time.time() - self.started,
+                'counters': [{'name': key[0], 'labels': dict(key[1]), 'value': value} for key, value in self.counters.items()],
+                'gauges': [{'name': key[0], 'labels': dict(key[1]), 'value': value} for key, value in self.gauges.items()],
+                'histograms': [{'name': key[0], 'labels': dict(key[1]), **hist.to_dict()} for key, hist in self.histograms.items()],
+            }
+    
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+    
+    def to_csv(self) -> str:
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(['type', 'name', 'labels', 'value', 'count', 'sum', 'p50', 'p90', 'p99'])
+        snapshot = self.snapshot()
+        for kind in ('counters', 'gauges'):
+            for metric in snapshot[kind]:
+                writer.writerow([kind[:-1], metric['name'], json.dumps(metric['labels']), metric['value'], '', '', '', '', ''])
+        for metric in snapshot['histograms']:
+            writer.writerow(['histogram', metric['name'], json.dumps(metric['labels']), '', metric['count'],
+                             metric['sum'], metric['p50'], metric['p90'], metric['p99']])
+        return out.getvalue()
+    
+    def to_prometheus(self) -> str:
+        lines = []
+        with self.lock:
+            for kind, metrics in (('counter', self.counters), ('gauge', self.gauges)):
+                for name in sorted({key[0] for key in metrics}):
+                    lines.append(f"# TYPE scribble_{name} {kind}")
+                    for key, value in metrics.items():
+                        if key[0] == name:
+                            lines.append(f"{_series('scribble_' + name, _labels(key))} {value}")
+            for name in sorted({key[0] for key in self.histograms}):
+                lines.append(f"# TYPE scribble_{name} histogram")
+                for key, hist in self.histograms.items():
+                    if key[0] != name:
+                        continue
+                    labels = _labels(key)
+                    sep = ',' if labels else ''
+                    cumulative = 0
+                    for bound, count in zip([str(b) for b in hist.bounds] + ['+Inf'], hist.counts):
+                        cumulative += count
+                        lines.append(f'scribble_{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+                    lines.append(f"{_series(f'scribble_{name}_sum', labels)} {hist.sum}")
+                    lines.append(f"{_series(f'scribble_{name}_count', labels)} {hist.count}")
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, path: str):
+        if path.endswith('.csv'):
+            text = self.to_csv()
+        elif path.endswith(('.prom', '.txt')):
+            text = self.to_prometheus()
+        else:
+            text = self.to_json()
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+    
+    def summary(self) -> List[str]:
+        lines = []
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+        for key, hist in histograms:
+            label = _series(key[0], _labels(key))
+            lines.append(f"{label}: n={hist.count} mean={hist.sum / hist.count * 1000:.0f}ms "
+                         f"p50<={hist.quantile(0.5) * 1000:.0f}ms p99<={hist.quantile(0.99) * 1000:.0f}ms")
+        with self.lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+        for key, value in counters + gauges:
+            lines.append(f"{_series(key[0], _labels(key))}: {value:g}")
+        return lines
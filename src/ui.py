@@ -1,27 +1,27 @@
+import re
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import Dict, Any, Callable, Optional
+from queue import Empty
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
 from src.api import API
-from src.utils import parse_time, get_category, center_window, validate_run
-
-GAME_ID = "nd27np51" # color book
-PLATFORM_ID = "8gej2n93" # pc
-
-CATEGORIES = {
-    "Solo": None, 
-    "Duo": None, 
-    "Trio": None,
-    "Quartet": None,
-    "Squad": None
-}
-VARIABLES = {
-    'variable_id': 'onv520ml', # gears?
-    'options': {
-        'Gearless': 'q757r8p1',
-        'Gear': '1gnx2m6l'
-    }
-}
+from src.config import GAME_ID, SUBMIT_WORKERS, REQUEST_RATE
+from src.dedupe import Ledger, fingerprint
+from src.edits import EditLog, build_edit, find_replace, fingerprint_as, set_field
+from src.games import Game, GameRegistry
+from src.importer import Importer
+from src.models import Run
+from src.pipeline import Pipeline
+from src.pool import AccountPool, account_path
+from src.queue_view import QueueView
+from src.reconcile import Reconciler
+from src.session import Session
+from src.store import QueueStore
+from src.submitter import Submitter
+from src.telemetry import Telemetry
+from src.utils import center_window
+from src.videos import MESSAGES as VIDEO_MESSAGES, OK, VideoChecker
 
 TEXT_WIDGET_STYLE = {
     'font': ('Segoe UI', 9),
@@ -58,7 +58,8 @@ class Login:
         
         button_frame = ttk.Frame(frame)
         button_frame.grid(row=2, column=0, columnspan=2, pady=(10, 0))
-        ttk.Button(button_frame, text="Login", command=self._do_login, width=10).pack(side="left", padx=4)
+        self.login_btn = ttk.Button(button_frame, text="Login", command=self._do_login, width=10)
+        self.login_btn.pack(side="left", padx=4)
         ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy, width=10).pack(side="left", padx=4)
         
         self.password_entry.bind('<Return>', lambda e: self._do_login())
@@ -72,7 +73,12 @@ class Login:
             messagebox.showerror("Error", "You gotta put your details in for the thing to work bro.", parent=self.dialog)
             return
         
-        self.on_login(username, password, self.dialog)
+        self.on_login(username, password, self)
+    
+    def set_busy(self, busy: bool):
+        if not self.dialog.winfo_exists():
+            return
+        self.login_btn.config(state="disabled" if busy else "normal", text="Logging in..." if busy else "Login")
     
     def withdraw(self):
         self.dialog.withdraw()
@@ -130,6 +136,182 @@ class TwoFactor:
         return self.result['token']
 
 
+class BulkEdit:
+    def __init__(self, parent, count: int, fields: List[Tuple[str, str]], on_apply: Callable):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Edit Runs")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.resizable(False, False)
+        self.count = count
+        self.fields = dict(fields)
+        self.on_apply = on_apply
+        
+        self._setup_ui()
+        center_window(self.dialog)
+    
+    def _setup_ui(self):
+        frame = ttk.Frame(self.dialog, padding="12")
+        frame.pack(fill="both", expand=True)
+        
+        ttk.Label(frame, text=f"Applies to {self.count} run(s).").grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 8))
+        self.mode = tk.StringVar(value="set")
+        ttk.Radiobutton(frame, text="Set", variable=self.mode, value="set").grid(row=1, column=0, sticky="w")
+        self.field_var = tk.StringVar(value=next(iter(self.fields)))
+        ttk.Combobox(frame, textvariable=self.field_var, values=list(self.fields), state="readonly", width=12).grid(row=1, column=1, padx=4)
+        self.value_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=self.value_var, width=24).grid(row=1, column=2, pady=2)
+        
+        ttk.Radiobutton(frame, text="Replace", variable=self.mode, value="replace").grid(row=2, column=0, sticky="w")
+        self.find_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=self.find_var, width=14).grid(row=2, column=1, padx=4)
+        self.replace_var = tk.StringVar()
+        ttk.Entry(frame, textvariable=self.replace_var, width=24).grid(row=2, column=2, pady=2)
+        ttk.Label(frame, text="in players, maps and times", foreground="gray").grid(row=3, column=1, columnspan=2, sticky="w", padx=4)
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=(10, 0))
+        ttk.Button(button_frame, text="Apply", command=self._on_apply, width=10).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy, width=10).pack(side="left", padx=5)
+    
+    def _on_apply(self):
+        if self.mode.get() == "set":
+            label = self.field_var.get()
+            change = set_field(self.fields[label], self.value_var.get())
+            description = f"set {label} to \"{self.value_var.get().strip()}\""
+        else:
+            if not self.find_var.get():
+                messagebox.showwarning("Warning", "Enter the text to find.", parent=self.dialog)
+                return
+            change = find_replace(self.find_var.get(), self.replace_var.get())
+            description = f"replace \"{self.find_var.get()}\" with \"{self.replace_var.get()}\""
+        
+        if self.on_apply(change, description):
+            self.dialog.destroy()
+
+
+class Accounts:
+    def __init__(self, parent, pool: AccountPool, primary: Session, on_add: Callable):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Accounts")
+        self.dialog.transient(parent)
+        self.pool = pool
+        self.primary = primary
+        self.on_add = on_add
+        
+        self._setup_ui()
+        center_window(self.dialog)
+        self._refresh()
+    
+    def _setup_ui(self):
+        frame = ttk.Frame(self.dialog, padding="12")
+        frame.pack(fill="both", expand=True)
+        
+        ttk.Label(frame, text="Submissions are spread across every logged in account.").pack(anchor="w", pady=(0, 8))
+        self.tree = ttk.Treeview(frame, columns=("account", "status", "in_flight", "submitted"), show="headings", height=8)
+        for column, text, width in (("account", "Account", 160), ("status", "Status", 100),
+                                    ("in_flight", "In flight", 70), ("submitted", "Submitted", 70)):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width)
+        self.tree.pack(fill="both", expand=True)
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(pady=(8, 0))
+        ttk.Button(button_frame, text="Add...", command=self.on_add, width=10).pack(side="left", padx=4)
+        ttk.Button(button_frame, text="Remove", command=self._remove, width=10).pack(side="left", padx=4)
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy, width=10).pack(side="left", padx=4)
+    
+    def _refresh(self):
+        if not self.dialog.winfo_exists():
+            return
+        
+        self.tree.delete(*self.tree.get_children())
+        for session in self.pool.sessions:
+            name = session.username or "(not logged in)"
+            if session is self.primary:
+                name += " (main)"
+            self.tree.insert("", "end", iid=str(id(session)), values=(
+                name,
+                "Logged in" if session.logged_in else "Logged out",
+                self.pool.in_flight.get(id(session), 0),
+                f"{self.pool.telemetry.counter('account_runs_total', account=session.username):g}",
+            ))
+        self.dialog.after(1000, self._refresh)
+    
+    def _remove(self):
+        selected = {int(iid) for iid in self.tree.selection()}
+        for session in list(self.pool.sessions):
+            if id(session) not in selected:
+                continue
+            if session is self.primary:
+                messagebox.showwarning("Warning", "The main account can't be removed, use Authenticate to switch it.", parent=self.dialog)
+                continue
+            self.pool.remove(session)
+            session.forget()
+        self._refresh()
+
+
+class Stats:
+    def __init__(self, parent, telemetry: Telemetry):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Stats")
+        self.dialog.transient(parent)
+        self.telemetry = telemetry
+        
+        self._setup_ui()
+        center_window(self.dialog)
+        self._refresh()
+    
+    def _setup_ui(self):
+        frame = ttk.Frame(self.dialog, padding="12")
+        frame.pack(fill="both", expand=True)
+        
+        self.header = ttk.Label(frame, justify="left")
+        self.header.pack(anchor="w", pady=(0, 8))
+        self.text = tk.Text(frame, height=18, width=80, state="disabled", wrap="none", **TEXT_WIDGET_STYLE)
+        self.text.pack(fill="both", expand=True)
+        
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(pady=(8, 0))
+        ttk.Button(button_frame, text="Export...", command=self._export, width=10).pack(side="left", padx=4)
+        ttk.Button(button_frame, text="Reset", command=self.telemetry.reset, width=10).pack(side="left", padx=4)
+        ttk.Button(button_frame, text="Close", command=self.dialog.destroy, width=10).pack(side="left", padx=4)
+    
+    def _refresh(self):
+        if not self.dialog.winfo_exists():
+            return
+        
+        t = self.telemetry
+        self.header.config(text=(
+            f"Submitted: {t.rate('runs_total', status='submitted'):.2f} runs/s    "
+            f"Queue: {t.gauge('queue_depth'):g} ({t.gauge('in_flight'):g} in flight)    "
+            f"Request rate: {t.gauge('request_rate'):.2f}/s\n"
+            f"Retries: {t.total('retries_total'):g}    Failed runs: {t.total('run_errors_total'):g}    "
+            f"Imported: {t.rate('import_runs_total'):.0f} runs/s"
+        ))
+        
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(t.summary()))
+        self.text.config(state="disabled")
+        self.dialog.after(500, self._refresh)
+    
+    def _export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.dialog,
+            title="Export stats",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("CSV", "*.csv"), ("Prometheus text", "*.prom")]
+        )
+        if not path:
+            return
+        
+        try:
+            self.telemetry.export(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Export failed: {e}", parent=self.dialog)
+
+
 class Window:
     def __init__(self, root):
         self.root = root
@@ -137,14 +319,87 @@ class Window:
         self.root.geometry("800x520")
         self.root.resizable(False, False)
         
-        self.api = API(GAME_ID)
+        self.api = API(GAME_ID, REQUEST_RATE)
+        self.session = Session(self.api)
+        self.pool = AccountPool([self.session])
         self.runs_list = []
-        self.categories = CATEGORIES.copy()
-        self.levels = {}
-        self.variables = VARIABLES.copy()
+        self.games = GameRegistry(self.api)
+        self.game = Game.placeholder(GAME_ID)
+        self.game_request = None
+        self.ledger = Ledger()
+        self.queued = set()
+        self.store = QueueStore()
+        self.reconciler = Reconciler(self.api)
+        self.submitter = Submitter(self.pool, SUBMIT_WORKERS, self.ledger, self.store, self.reconciler)
+        self.video_checker = VideoChecker(telemetry=self.api.telemetry)
+        self.edits = EditLog()
+        self.submission = None
+        self.interrupted = set()
+        self.importer = None
+        self.pipeline = None
+        self.import_count = 0
+        self.import_duplicates = 0
+        
+        self.started = False
         
         self._setup_ui()
-        self.root.after(100, self._fetch_game_data)
+        self._restore_queue()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        # game data and saved sessions go to the network, so they wait until the window is drawn and usable
+        self.root.bind('<Map>', self._on_map, add='+')
+    
+    def _on_map(self, event):
+        if event.widget is not self.root or self.started:
+            return
+        self.started = True
+        self.root.after_idle(self._start)
+    
+    def _start(self):
+        self._load_game(GAME_ID)
+        self._restore_session()
+    
+    def _restore_queue(self):
+        # runs that were awaiting a response when the app last closed may have been stored by speedrun.com
+        self.interrupted = self.store.in_flight()
+        for run in self.store.unfinished():
+            fp = fingerprint(run)
+            if fp in self.queued:
+                self.store.remove(run.queue_id)
+                continue
+            self.queued.add(fp)
+            self.runs_list.append(run)
+        
+        self.queue_view.refresh()
+        self._update_run_counter()
+        if self.runs_list:
+            self.submit_btn.config(state="normal")
+    
+    def _restore_session(self):
+        # extra accounts are checked quietly, an expired one just drops out of the pool
+        for session in self.pool.restore(GAME_ID, REQUEST_RATE):
+            self._when_done(session.validate(), lambda valid: None)
+        
+        username = self.session.restore()
+        if username is None:
+            return
+        
+        self.login_status.config(text=f"Logged in as {username}", foreground="green")
+        
+        def on_done(valid: Optional[bool]):
+            if valid is None:
+                self.login_status.config(text=f"Logged in as {username} (couldn't reach speedrun.com)", foreground="orange")
+            elif not valid:
+                self.login_status.config(text="Session expired, please log in again", foreground="red")
+        
+        self._when_done(self.session.validate(), on_done)
+    
+    def _on_close(self):
+        if self.importer:
+            self.importer.cancel()
+        if self.pipeline:
+            self.pipeline.cancel()
+        self.store.close()
+        self.root.destroy()
         
     def _setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="12")
@@ -162,38 +417,60 @@ class Window:
         left_frame.pack(side="left", fill="both", expand=False, padx=(0, 8))
         
         fields = [
+            ("Game:", "game"),
             ("Category:", "category"),
             ("Map:", "map"),
             ("Gear:", "gear"),
+            ("Platform:", "platform"),
             ("Players:", "players"),
             ("Time:", "time"),
             ("Video URL:", "video"),
         ]
         
         for idx, (label, field) in enumerate(fields):
-            ttk.Label(left_frame, text=label, width=10, anchor="w").grid(
-                row=idx, column=0, sticky="w", pady=3, padx=(0, 8))
+            label_widget = ttk.Label(left_frame, text=label, width=10, anchor="w")
+            label_widget.grid(row=idx, column=0, sticky="w", pady=3, padx=(0, 8))
+            if field == "gear":
+                self.variable_label = label_widget
             
             widget = self._create_field_widget(left_frame, field)
             widget.grid(row=idx, column=1, sticky="ew", pady=3)
         
         ttk.Label(left_frame, text="Description:", width=10, anchor="nw").grid(
-            row=6, column=0, sticky="nw", pady=3, padx=(0, 8))
-        self.description_text = self._create_text_widget(left_frame, height=10, width=25)
-        self.description_text.grid(row=6, column=1, sticky="ew", pady=3)
+            row=len(fields), column=0, sticky="nw", pady=3, padx=(0, 8))
+        self.description_text = self._create_text_widget(left_frame, height=4, width=25)
+        self.description_text.grid(row=len(fields), column=1, sticky="ew", pady=3)
         
         btn_frame = ttk.Frame(left_frame)
-        btn_frame.grid(row=7, column=0, columnspan=2, pady=(10, 0))
+        btn_frame.grid(row=len(fields) + 1, column=0, columnspan=2, pady=(10, 0))
         ttk.Button(btn_frame, text="Add Run", command=self._add_run, width=13).pack(side="left", padx=2)
-        ttk.Button(btn_frame, text="Import Text", command=self._import_text, width=13).pack(side="left", padx=2)
+        self.import_btn = ttk.Button(btn_frame, text="Import Text", command=self._import_text, width=13)
+        self.import_btn.pack(side="left", padx=2)
+        
+        self.stream_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(left_frame, text="Submit while importing", variable=self.stream_var).grid(
+            row=len(fields) + 2, column=0, columnspan=2, pady=(6, 0))
+        
+        self.import_row = len(fields) + 3
+        self.import_frame = ttk.Frame(left_frame)
+        self.import_progress = ttk.Progressbar(self.import_frame, mode="determinate", maximum=1.0)
+        self.import_progress.pack(side="left", fill="x", expand=True, padx=2)
+        ttk.Button(self.import_frame, text="Cancel", command=self._cancel_import, width=8).pack(side="left", padx=2)
         
         left_frame.columnconfigure(1, weight=1)
         
     def _create_field_widget(self, parent, field: str):
-        if field == "category":
+        if field == "game":
+            self.game_var = tk.StringVar(value=self.game.label)
+            widget = ttk.Combobox(parent, textvariable=self.game_var,
+                values=[self.games.label(game_id) for game_id in self.games.known()], width=25)
+            widget.bind("<<ComboboxSelected>>", lambda e: self._select_game())
+            widget.bind("<Return>", lambda e: self._select_game())
+            self.game_combo = widget
+        elif field == "category":
             self.category_var = tk.StringVar()
             widget = ttk.Combobox(parent, textvariable=self.category_var,
-                values=list(self.categories.keys()), state="readonly", width=25)
+                values=list(self.game.categories.keys()), state="readonly", width=25)
             self.category_combo = widget
         elif field == "map":
             self.level_var = tk.StringVar()
@@ -203,6 +480,10 @@ class Window:
             self.variable_var = tk.StringVar()
             widget = ttk.Combobox(parent, textvariable=self.variable_var, state="readonly", width=25)
             self.variable_combo = widget
+        elif field == "platform":
+            self.platform_var = tk.StringVar()
+            widget = ttk.Combobox(parent, textvariable=self.platform_var, state="readonly", width=25)
+            self.platform_combo = widget
         elif field == "players":
             widget = self._create_text_widget(parent, height=3, width=25)
             self.players_entry = widget
@@ -223,37 +504,88 @@ class Window:
         right_frame.pack(side="right", fill="both", expand=True)
         self.queue_label = right_frame
         
-        columns = ("Category", "Map", "Gear", "Players", "Time")
-        self.runs_tree = ttk.Treeview(right_frame, columns=columns, show="headings", height=15)
-        
-        column_widths = {"Category": 70, "Map": 90, "Gear": 60, "Players": 100, "Time": 60}
-        for col in columns:
-            self.runs_tree.heading(col, text=col)
-            self.runs_tree.column(col, width=column_widths[col], stretch=True)
-        
-        self.runs_tree.pack(fill="both", expand=True, pady=(0, 8))
+        self.queue_view = QueueView(right_frame, self.runs_list, height=14)
+        self.queue_view.frame.pack(fill="both", expand=True, pady=(0, 8))
+        
+        edit_frame = ttk.Frame(right_frame)
+        edit_frame.pack(fill="x", pady=(0, 4))
+        ttk.Button(edit_frame, text="Edit...", command=self._show_edit, width=8).pack(side="left", padx=2)
+        self.undo_btn = ttk.Button(edit_frame, text="Undo", command=self._undo, state="disabled", width=6)
+        self.undo_btn.pack(side="left", padx=2)
+        self.redo_btn = ttk.Button(edit_frame, text="Redo", command=self._redo, state="disabled", width=6)
+        self.redo_btn.pack(side="left", padx=2)
+        self.edit_status = ttk.Label(edit_frame, text="", foreground="gray")
+        self.edit_status.pack(side="left", padx=6)
+        for sequence, action in (('<Control-z>', self._undo), ('<Control-y>', self._redo), ('<Control-Z>', self._redo)):
+            self.root.bind(sequence, lambda e, action=action: self._shortcut(e, action))
         
         action_frame = ttk.Frame(right_frame)
         action_frame.pack(fill="x")
         ttk.Button(action_frame, text="Remove Selected", command=self._remove_run, width=16).pack(side="left", padx=2)
+        ttk.Button(action_frame, text="Clear", command=self._clear_queue, width=6).pack(side="left", padx=2)
+        self.check_btn = ttk.Button(action_frame, text="Check Videos", command=self._check_videos, width=12)
+        self.check_btn.pack(side="left", padx=2)
         self.submit_btn = ttk.Button(action_frame, text="Submit All Runs",
             command=self._submit_all_runs, state="disabled", width=16)
         self.submit_btn.pack(side="left", padx=2)
+        self.submit_progress = ttk.Progressbar(action_frame, mode="determinate")
+        self.submit_progress.pack(side="left", fill="x", expand=True, padx=2)
         
     def _create_auth_panel(self, parent):
         auth_frame = ttk.Frame(parent)
         auth_frame.pack(fill="x", pady=(10, 0))
         ttk.Button(auth_frame, text="Authenticate", command=self._show_login_dialog, width=13).pack(side="left")
+        ttk.Button(auth_frame, text="Accounts", command=self._show_accounts, width=10).pack(side="left", padx=(4, 0))
         self.login_status = ttk.Label(auth_frame, text="Not logged in", foreground="red")
         self.login_status.pack(side="left", padx=10)
+        ttk.Button(auth_frame, text="Stats", command=self._show_stats, width=8).pack(side="right")
+    
+    def _show_stats(self):
+        Stats(self.root, self.api.telemetry)
         
     def _show_login_dialog(self):
         Login(self.root, self._handle_login)
         
-    def _handle_login(self, username: str, password: str, dialog):
-        result = self.api.login(username, password)
+    def _show_accounts(self):
+        Accounts(self.root, self.pool, self.session, self._add_account)
+    
+    def _add_account(self):
+        def on_login(username: str, password: str, dialog):
+            session = Session(API(GAME_ID, REQUEST_RATE), path=account_path(username))
+            self._handle_login(username, password, dialog, session=session)
+        
+        Login(self.root, on_login)
+    
+    def _handle_login(self, username: str, password: str, dialog, token: Optional[str] = None,
+                      session: Optional[Session] = None):
+        session = session or self.session
+        dialog.set_busy(True)
         
-        if result.tokenChallengeSent:
+        def on_error(error):
+            if not dialog.dialog.winfo_exists():
+                return
+            dialog.set_busy(False)
+            dialog.deiconify()
+            messagebox.showerror("Error", f"Login failed: {error}", parent=dialog.dialog)
+        
+        self._when_done(session.login(username, password, token),
+                        lambda result: self._on_login_result(result, username, password, dialog, token, session), on_error)
+    
+    def _on_login_result(self, result, username: str, password: str, dialog, token: Optional[str], session: Session):
+        dialog.set_busy(False)
+        
+        if result.get('loggedIn') and session is not self.session:
+            self.pool.add(session)
+            dialog.destroy()
+            messagebox.showinfo("Success", f"Added {username} to the account pool.")
+        elif result.get('loggedIn'):
+            self.login_status.config(text=f"Logged in as {username}", foreground="green")
+            self.submit_btn.config(state="normal")
+            dialog.destroy()
+            messagebox.showinfo("Success", "Logged in successfully!")
+        elif not dialog.dialog.winfo_exists():
+            return
+        elif result.get('tokenChallengeSent') and token is None:
             dialog.withdraw()
             token = TwoFactor(self.root).show()
             
@@ -261,39 +593,72 @@ class Window:
                 dialog.destroy()
                 return
             
-            result = self.api.login(username, password, token)
-            
-            if not result.loggedIn:
-                dialog.deiconify()
-                messagebox.showerror("Error", "Invalid 2FA token, did you make a typo?", parent=dialog.dialog)
-                return
-        elif not result.loggedIn:
+            self._handle_login(username, password, dialog, token, session)
+        elif token:
+            dialog.deiconify()
+            messagebox.showerror("Error", "Invalid 2FA token, did you make a typo?", parent=dialog.dialog)
+        else:
             messagebox.showerror("Error", "Login failed, probably mistyped your password?", parent=dialog.dialog)
+            
+    def _when_done(self, future, on_done: Callable, on_error: Optional[Callable] = None):
+        self.root.after(50, self._poll_future, future, on_done, on_error)
+    
+    def _poll_future(self, future, on_done: Callable, on_error: Optional[Callable]):
+        if not future.done():
+            self.root.after(50, self._poll_future, future, on_done, on_error)
             return
         
-        self.api.get_csrf_token()
-        self.login_status.config(text=f"Logged in as {username}", foreground="green")
-        self.submit_btn.config(state="normal")
-        dialog.destroy()
-        messagebox.showinfo("Success", "Logged in successfully!")
-            
-    def _fetch_game_data(self):
-        try:
-            game_response = self.api.fetch_game_data()
+        error = future.exception()
+        if error is None:
+            on_done(future.result())
+        elif on_error:
+            on_error(error)
+    
+    def _select_game(self):
+        text = self.game_var.get().strip()
+        match = re.search(r'\(([^()]+)\)$', text)
+        game_id = match.group(1) if match else text
+        if game_id and game_id != self.game.game_id:
+            self._load_game(game_id)
+    
+    def _load_game(self, game_id: str):
+        self.game_request = game_id
+        game, stale = self.games.cached(game_id)
+        if game:
+            self._apply_game(game)
+            if not stale:
+                return
             
-            if 'categories' in game_response:
-                for category in game_response['categories']:
-                    if category.get('name') in self.categories:
-                        self.categories[category['name']] = category['id']
+        def on_done(game_data: Dict[str, Any]):
+            game = self.games.add(game_id, game_data)
+            if self.game_request == game_id:
+                self._apply_game(game)
+        
+        def on_error(error):
+            if not game:
+                messagebox.showerror("Error", f"Failed to fetch game data for {game_id}: {error}")
+                self.game_var.set(self.game.label)
             
-            if 'levels' in game_response:
-                for level in game_response['levels']:
-                    self.levels[level['name']] = level['id']
-                self.level_combo['values'] = list(self.levels.keys())
+        self._when_done(self.session.fetch_game_data(refresh=True, game_id=game_id), on_done, on_error)
             
-            self.variable_combo['values'] = list(self.variables['options'].keys())
-        except:
-            messagebox.showerror("Error", "Failed to fetch game data")
+    def _apply_game(self, game: Game):
+        self.game = game
+        self.game_var.set(game.label)
+        self.game_combo['values'] = [self.games.label(game_id) for game_id in self.games.known()]
+        
+        self.category_combo['values'] = list(game.categories.keys())
+        self.level_combo['values'] = list(game.levels.keys())
+        self.variable_combo['values'] = list(game.variables['options'].keys())
+        self.variable_combo.config(state="readonly" if game.variables['options'] else "disabled")
+        self.variable_label.config(text=f"{game.variable_name or 'Variable'}:")
+        self.platform_combo['values'] = list(game.platforms.keys())
+        
+        for var, values in ((self.category_var, game.categories), (self.level_var, game.levels),
+                            (self.variable_var, game.variables['options'])):
+            if var.get() not in values:
+                var.set("")
+        platform = [name for name, platform_id in game.platforms.items() if platform_id == game.platform_id]
+        self.platform_var.set(platform[0] if platform else "")
             
     def _add_run(self):
         category = self.category_var.get()
@@ -308,10 +673,34 @@ class Window:
             messagebox.showwarning("Warning", "Please fill in all required fields")
             return
         
-        run_data = self._build_run_data(category, level, variable, players, time, video, description)
+        try:
+            run_data = Run.from_fields({
+                'category': category,
+                'map': level,
+                'variable': variable,
+                'players': players,
+                'time': time,
+                'video': video,
+                'description': description,
+                'game_id': self.game.game_id,
+                'platform_id': self.game.platform(self.platform_var.get()),
+            }, self.game.categories, self.game.levels, self.game.variables)
+        except ValueError as e:
+            messagebox.showwarning("Warning", str(e))
+            return
+        
+        fp = fingerprint(run_data)
+        if fp in self.queued:
+            messagebox.showwarning("Warning", "This run is already in the queue.")
+            return
+        if fp in self.ledger:
+            messagebox.showwarning("Warning", "This run has already been submitted.")
+            return
         
+        self.queued.add(fp)
+        self.store.add(run_data)
         self.runs_list.append(run_data)
-        self.runs_tree.insert('', 'end', values=(category, level, variable, players, time))
+        self.queue_view.refresh()
         self._update_run_counter()
         
         if len(self.runs_list) > 0:
@@ -319,22 +708,6 @@ class Window:
         
         self._clear_form()
         
-    def _build_run_data(self, category: str, level: str, variable: str, players: str, 
-                        time: str, video: str, description: str) -> Dict[str, Any]:
-        return {
-            'category': category,
-            'category_id': self.categories.get(category),
-            'level': level,
-            'level_id': self.levels.get(level),
-            'variable': variable,
-            'variable_id': self.variables.get('variable_id') if variable else None,
-            'variable_value_id': self.variables.get('options', {}).get(variable) if variable else None,
-            'players': players,
-            'time': time,
-            'video': video,
-            'description': description
-        }
-        
     def _clear_form(self):
         self.players_entry.delete("1.0", "end")
         self.time_entry.delete(0, 'end')
@@ -342,16 +715,138 @@ class Window:
         self.description_text.delete("1.0", "end")
         
     def _remove_run(self):
-        selected = self.runs_tree.selection()
+        # the submitter works through its own copy of the queue, a run removed now would still go out
+        if self.submitter.running:
+            return
+        selected = self.queue_view.selected_runs()
         if selected:
-            item = selected[0]
-            index = self.runs_tree.index(item)
-            self.runs_tree.delete(item)
-            del self.runs_list[index]
-            self._update_run_counter()
+            self._drop_runs(selected)
+    
+    def _check_videos(self):
+        if not self.runs_list:
+            messagebox.showwarning("Warning", "There's no runs to check.")
+            return
+        
+        runs = list(self.runs_list)
+        self.check_btn.config(state="disabled", text="Checking...")
+        
+        def on_done(results: Dict[str, str]):
+            self.check_btn.config(state="normal", text="Check Videos")
+            bad = [(run, results[run.video]) for run in runs if results.get(run.video, OK) != OK]
+            if not bad:
+                messagebox.showinfo("Videos", f"All {len(results)} video link(s) are reachable.")
+                return
             
-            if len(self.runs_list) == 0:
-                self.submit_btn.config(state="disabled")
+            self.queue_view.select([run for run, _ in bad])
+            errors = [f"{run.level} ({run.players_text}): {VIDEO_MESSAGES[result]}" for run, result in bad[:10]]
+            message = f"{len(bad)} run(s) have a video that couldn't be verified, they are selected in the queue:\n" + "\n".join(errors)
+            if len(bad) > 10:
+                message += f"\n\n...and {len(bad) - 10} more"
+            messagebox.showwarning("Videos", message)
+        
+        self._when_done(self.video_checker.check_all(run.video for run in runs), on_done)
+            
+    def _shortcut(self, event, action: Callable):
+        # text fields keep their own ctrl+z
+        if not isinstance(event.widget, (tk.Text, tk.Entry, ttk.Entry)):
+            action()
+    
+    def _game_for(self, game_id: Optional[str]) -> Optional[Game]:
+        game_id = game_id or GAME_ID
+        if game_id == self.game.game_id:
+            return self.game
+        return self.games[game_id] if game_id in self.games else None
+    
+    def _show_edit(self):
+        if self.submitter.running:
+            return
+        runs = self.queue_view.selected_runs() or list(self.runs_list)
+        if not runs:
+            messagebox.showwarning("Warning", "There's no runs to edit.")
+            return
+        
+        fields = [("Map", 'map'), (self.game.variable_name or "Variable", 'variable'), ("Players", 'players'),
+                  ("Time", 'time'), ("Video", 'video'), ("Category", 'category'), ("Description", 'description')]
+        BulkEdit(self.root, len(runs), fields, lambda change, description: self._edit_runs(runs, change, description))
+    
+    def _edit_runs(self, runs: List[Run], change: Callable, description: str) -> bool:
+        label = f"{description} on {len(runs)} run(s)"
+        edit, errors = build_edit(label, runs, change, self._game_for, self.queued)
+        if edit is None and not errors:
+            messagebox.showinfo("Edit", "Nothing to change.")
+            return False
+        
+        if edit is not None:
+            self._change_queue([edit], lambda: self.edits.push(edit), False)
+        if errors:
+            changed = len(edit.changes) if edit else 0
+            lines = [f"{run.level} ({run.players_text}): {error}" for run, error in errors[:10]]
+            message = f"Changed {changed} run(s), {len(errors)} left as they were:\n" + "\n".join(lines)
+            if len(errors) > 10:
+                message += f"\n\n...and {len(errors) - 10} more"
+            messagebox.showwarning("Edit", message)
+        return edit is not None
+    
+    def _undo(self):
+        self._change_queue(self.edits.done[-1:], self.edits.undo, True)
+    
+    def _redo(self):
+        self._change_queue(self.edits.undone[-1:], self.edits.redo, False)
+    
+    def _change_queue(self, edits: list, action: Callable, undo: bool):
+        if not edits or self.submitter.running:
+            return
+        
+        # runs dropped or submitted since the edit are left alone
+        queued = {id(run) for run in self.runs_list}
+        states = [(run, values) for run, values in edits[0].states(undo) if id(run) in queued]
+        runs = [run for run, _ in states]
+        
+        # runs added since the edit may now match what it would bring back
+        released = {fingerprint(run) for run in runs}
+        taken = set()
+        for run, values in states:
+            fp = fingerprint_as(run, values)
+            if fp in taken or (fp in self.queued and fp not in released):
+                messagebox.showwarning("Undo" if undo else "Redo",
+                                       f"Can't {'undo' if undo else 'redo'} \"{edits[0].label}\", "
+                                       f"it would duplicate another queued run ({run.level}, {run.players_text})")
+                return
+            taken.add(fp)
+        
+        for run in runs:
+            self.queued.discard(fingerprint(run))
+        action()
+        for run in runs:
+            self.queued.add(fingerprint(run))
+        self.store.update(*runs)
+        self.queue_view.refresh_rows(runs)
+        self._update_edit_buttons()
+    
+    def _update_edit_buttons(self):
+        self.undo_btn.config(state="normal" if self.edits.can_undo else "disabled")
+        self.redo_btn.config(state="normal" if self.edits.can_redo else "disabled")
+        self.edit_status.config(text=f"Undo: {self.edits.done[-1].label}" if self.edits.can_undo else "")
+    
+    def _clear_queue(self):
+        if not self.runs_list or self.submitter.running:
+            return
+        if not messagebox.askyesno("Clear queue", f"Remove all {len(self.runs_list)} run(s) from the queue?"):
+            return
+        self._drop_runs(list(self.runs_list))
+    
+    def _drop_runs(self, runs: list):
+        dropped = {id(run) for run in runs}
+        for run in runs:
+            self.queued.discard(fingerprint(run))
+        self.store.remove(*(run.queue_id for run in runs))
+        self.runs_list[:] = [run for run in self.runs_list if id(run) not in dropped]
+        self.queue_view.forget(runs)
+        self.queue_view.refresh()
+        self._update_run_counter()
+        
+        if len(self.runs_list) == 0:
+            self.submit_btn.config(state="disabled")
                 
     def _update_run_counter(self):
         count = len(self.runs_list)
@@ -359,120 +854,212 @@ class Window:
         
     def _import_text(self):
         filepath = filedialog.askopenfilename(
-            title="Select text file",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            title="Select import file",
+            filetypes=[("Text files", "*.txt"), ("CSV files", "*.csv *.tsv"), ("JSON Lines", "*.jsonl *.ndjson *.json"),
+                       ("LiveSplit splits", "*.lss"), ("All files", "*.*")]
         )
         
         if not filepath:
             return
         
+        # lines without a category fall back to the selected one if the game has no Solo/Duo/... categories
+        self.game.default_category = self.category_var.get() or None
+        if self.stream_var.get():
+            self._stream_import(filepath)
+            return
+        
+        self.importer = Importer(self.game, telemetry=self.api.telemetry)
+        self.import_count = 0
+        self.import_duplicates = 0
+        self.import_btn.config(state="disabled")
+        self.import_progress.config(value=0)
+        self.import_frame.grid(row=self.import_row, column=0, columnspan=2, sticky="ew", pady=(6, 0))
+        self.importer.start(filepath)
+        self.root.after(1, self._poll_import)
+    
+    def _stream_import(self, filepath: str):
+        if not self.pool.active():
+            messagebox.showerror("Error", "You're not logged in.")
+            return
+        
+        if self.submitter.running:
+            return
+        
+        self.pipeline = Pipeline(self.game, self.submitter, self.store)
+        self.submission = {'submitted': [], 'duplicate': [], 'failed': [], 'started': time.monotonic(),
+                           'streamed': {'submitted': 0, 'duplicate': 0}, 'retries': self.api.telemetry.total('retries_total')}
+        self.import_btn.config(state="disabled")
+        self.submit_btn.config(state="disabled")
+        self.import_progress.config(value=0)
+        self.submit_progress.config(maximum=1.0, value=0)
+        self.import_frame.grid(row=self.import_row, column=0, columnspan=2, sticky="ew", pady=(6, 0))
+        self.pipeline.start(filepath)
+        self.root.after(1, self._poll_submission)
+    
+    def _cancel_import(self):
+        if self.importer:
+            self.importer.cancel()
+        if self.pipeline:
+            self.pipeline.cancel()
+    
+    def _poll_import(self):
         try:
-            with open(filepath, 'r') as f:
-                content = f.read()
+            status, payload, extra = self.importer.events.get_nowait()
+        except Empty:
+            self.root.after(50, self._poll_import)
+            return
             
-            lines = content.strip().split('\n')
-            imported = 0
-            errors = []
+        if status == 'done':
+            self.import_frame.grid_remove()
+            self.import_btn.config(state="normal")
+            self._update_run_counter()
+            self._show_import_results(self.import_count, payload, extra, self.import_duplicates)
+            self.importer = None
+            return
             
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if not line:
-                    continue
+        if not self.importer.cancelled.is_set():
+            for run in payload:
+                if self._import_run_data(run):
+                    self.import_count += 1
+                else:
+                    self.import_duplicates += 1
+            self.import_progress.config(value=extra)
+            self.queue_view.refresh()
+            self._update_run_counter()
+            if self.runs_list:
+                self.submit_btn.config(state="normal")
                 
-                try:
-                    run_data = self._parse_import_line(line)
-                    if not run_data:
-                        errors.append(f"Line {line_num}: Invalid format.")
-                        continue
+        self.root.after(1, self._poll_import)
                     
-                    error = validate_run(run_data, self.levels, self.variables)
-                    if error:
-                        errors.append(f"Line {line_num}: {error}")
-                        continue
-                    
-                    self._import_run_data(run_data)
-                    imported += 1
-                    
-                except Exception as e:
-                    errors.append(f"Line {line_num}: {str(e)}")
-                    continue
-            
-            self._show_import_results(imported, errors)
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Text import failed: {str(e)}")
-            
-    def _parse_import_line(self, line: str) -> Optional[Dict[str, str]]:
-        parts = [p.strip() for p in line.split('|')]
-        
-        if len(parts) < 5:
-            return None
-        
-        return {
-            'players': parts[0],
-            'map': parts[1],
-            'time': parts[2],
-            'variable': parts[3],
-            'video': parts[4],
-            'description': parts[5] if len(parts) > 5 else '',
-            'category': get_category(parts[0])
-        }
-        
-    def _show_import_results(self, imported: int, errors: list):
+    def _show_import_results(self, imported: int, errors: list, error_count: int, duplicates: int = 0):
+        skipped = f"\n\nSkipped {duplicates} run(s) already queued or submitted." if duplicates else ""
         if errors:
-            error_msg = f"Imported {imported} run(s) with {len(errors)} error(s):\n\n" + "\n".join(errors[:10])
-            if len(errors) > 10:
-                error_msg += f"\n\n...and {len(errors) - 10} more errors"
+            error_msg = f"Imported {imported} run(s) with {error_count} error(s):\n\n" + "\n".join(errors)
+            if error_count > len(errors):
+                error_msg += f"\n\n...and {error_count - len(errors)} more errors"
+            error_msg += skipped
             messagebox.showwarning("Import Complete (with errors)", error_msg)
         else:
-            messagebox.showinfo("Success", f"Imported {imported} run(s)")
+            messagebox.showinfo("Success", f"Imported {imported} run(s){skipped}")
             
-    def _import_run_data(self, run_data: Dict[str, Any]):
-        category = run_data.get('category', '')
-        level = run_data.get('map', '')
-        variable = run_data.get('variable', '')
-        players = run_data.get('players', '')
-        time = run_data.get('time', '')
-        video = run_data.get('video', '')
-        description = run_data.get('description', '')
-        
-        if not all([category, level, players, time]):
-            return
-        
-        run = self._build_run_data(category, level, variable, players, time, video, description)
+    def _import_run_data(self, run: Run) -> bool:
+        fp = fingerprint(run)
+        if fp in self.queued or fp in self.ledger:
+            return False
         
+        self.queued.add(fp)
+        self.store.add(run)
         self.runs_list.append(run)
-        self.runs_tree.insert('', 'end', values=(category, level, variable, players, time, video))
+        return True
         
     def _submit_all_runs(self):
         if not self.runs_list:
             messagebox.showwarning("Warning", "There's no runs to submit.")
             return
         
-        if not self.api.csrf_token:
+        if not self.pool.active():
             messagebox.showerror("Error", "You're not logged in.")
             return
         
-        successful = 0
-        failed = 0
+        if self.submitter.running:
+            return
         
-        for run in self.runs_list:
-            try:
-                time_obj = parse_time(run['time'])
-                self.api.submit_run(run, time_obj)
-                successful += 1
-            except:
-                failed += 1
+        interrupted = [run for run in self.runs_list if run.queue_id in self.interrupted]
+        if interrupted and not messagebox.askyesno(
+                "Submit", f"{len(interrupted)} run(s) were being submitted when Scribble last closed and may already be on "
+                          f"speedrun.com. Runs found on the leaderboard or awaiting verification are skipped, the rest are "
+                          f"submitted again.\n\nContinue?"):
+            return
+        self.interrupted.clear()
         
-        self._show_submission_results(successful, failed)
+        self.submission = {'submitted': [], 'duplicate': [], 'failed': [], 'started': time.monotonic(), 'streamed': {},
+                           'retries': self.api.telemetry.total('retries_total')}
+        self.submit_btn.config(state="disabled")
+        self.submit_progress.config(maximum=len(self.runs_list), value=0)
+        self.submitter.start(self.runs_list)
+        self.root.after(50, self._poll_submission)
         
-    def _show_submission_results(self, successful: int, failed: int):
-        message = f"Submission complete! (s: {successful}/f: {failed})"
-        if failed == 0:
+    def _poll_submission(self):
+        while True:
+            try:
+                status, run, result = self.submitter.events.get_nowait()
+            except Empty:
+                break
+            
+            if status == 'done':
+                self._finish_submission()
+                return
+            
+            if self.pipeline is None:
+                self.submission[status].append((run, result))
+                self.submit_progress.step(1)
+            elif status == 'failed':
+                # streamed runs only enter the queue when they need a retry
+                self.submission[status].append((run, result))
+                self.queued.add(fingerprint(run))
+                self.runs_list.append(run)
+            else:
+                self.submission['streamed'][status] += 1
+        
+        if self.pipeline is not None:
+            self.import_progress.config(value=self.pipeline.progress)
+            self.submit_progress.config(value=self.pipeline.progress)
+            if self.submission['failed']:
+                self.queue_view.refresh()
+                self._update_run_counter()
+        self.root.after(50, self._poll_submission)
+        
+    def _finish_submission(self):
+        elapsed = time.monotonic() - self.submission['started']
+        extra = ""
+        if self.pipeline is not None:
+            self.import_frame.grid_remove()
+            self.import_btn.config(state="normal")
+            if self.pipeline.duplicates:
+                extra += f"\n\nSkipped {self.pipeline.duplicates} duplicate line(s) in the file."
+            if self.pipeline.error_count:
+                extra += f"\n\n{self.pipeline.error_count} line(s) could not be imported:\n" + "\n".join(self.pipeline.errors)
+            self.pipeline = None
+        
+        # telemetry counts retries since startup, a batch only reports its own
+        retries = self.api.telemetry.total('retries_total') - self.submission['retries']
+        self._show_submission_results(self.submission['submitted'], self.submission['failed'], self.submission['duplicate'],
+                                      elapsed, self.submission['streamed'], extra, retries)
+    
+    def _show_submission_results(self, submitted: list, failed: list, duplicates: list, elapsed: float = 0.0,
+                                 streamed: Optional[Dict[str, int]] = None, extra: str = "", retries: float = 0):
+        done = [run for run, _ in submitted + duplicates]
+        done_ids = {id(run) for run in done}
+        for run in done:
+            self.queued.discard(fingerprint(run))
+        self.runs_list[:] = [run for run in self.runs_list if id(run) not in done_ids]
+        self.queue_view.forget(done)
+        self.queue_view.refresh()
+        self._update_run_counter()
+        self.submit_progress.config(value=0)
+        self.submit_btn.config(state="normal" if self.runs_list else "disabled")
+        if self.session.username and not self.session.logged_in:
+            self.login_status.config(text="Session expired, please log in again", foreground="red")
+        
+        submitted_count = len(submitted) + (streamed or {}).get('submitted', 0)
+        duplicate_count = len(duplicates) + (streamed or {}).get('duplicate', 0)
+        message = f"Submission complete! (s: {submitted_count}/f: {len(failed)}) in {elapsed:.1f}s"
+        if submitted_count and elapsed:
+            message += f", {submitted_count / elapsed:.2f} runs/s"
+        if retries:
+            message += f"\n{retries:g} request(s) were retried, see Stats for details."
+        if duplicate_count:
+            message += f"\n\nSkipped {duplicate_count} run(s) that were already submitted or are on the leaderboard."
+        message += extra
+        if not failed:
             messagebox.showinfo("Success", message)
-            self.runs_list.clear()
-            for item in self.runs_tree.get_children():
-                self.runs_tree.delete(item)
-            self._update_run_counter()
         else:
-            messagebox.showwarning("Success (some failed)", message)
\ No newline at end of file
+            classes = {}
+            for _, error in failed:
+                classes[type(error).__name__] = classes.get(type(error).__name__, 0) + 1
+            message += "\nErrors: " + ", ".join(f"{name} x{count}" for name, count in classes.items())
+            errors = [f"{run.level} ({run.players_text}): {error}" for run, error in failed[:10]]
+            message += "\n\nFailed runs were kept in the queue:\n" + "\n".join(errors)
+            if len(failed) > 10:
+                message += f"\n\n...and {len(failed) - 10} more"
+            messagebox.showwarning("Success (some failed)", message)
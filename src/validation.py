@@ -0,0 +1,76 @@
+import re
+from typing import Container, Dict, List, Optional, Sequence, Tuple
+
+TIME_RE = re.compile(r'(?:(?:(\d+):)?(\d+):)?(\d+)(?:\.(\d+))?')
+VIDEO_RE = re.compile(r'https?://[^\s/?#]+\.[^\s/?#]+(?:[/?#]\S*)?', re.IGNORECASE)
+PLAYER_RE = re.compile(r'[^,\s]')
+
+PLAYERS = 'players'
+CATEGORY = 'category'
+MAP = 'map'
+TIME_FORMAT = 'time_format'
+TIME_RANGE = 'time_range'
+TIME_ZERO = 'time_zero'
+VARIABLE = 'variable'
+VIDEO = 'video'
+
+MESSAGES = {
+    PLAYERS: "Invalid player count (0)",
+    CATEGORY: "Invalid category ({category}), the game has no such category",
+    MAP: "Invalid map ({map})",
+    TIME_FORMAT: "Invalid time format ({time}), expected [[h:]m:]s[.ms]",
+    TIME_RANGE: "Invalid time ({time}), minutes and seconds must be below 60",
+    TIME_ZERO: "Invalid time ({time}), must be above zero",
+    VARIABLE: "Invalid gear/gearless value ({variable})",
+    VIDEO: "Invalid video URL ({video})",
+}
+
+Time = Tuple[int, int, int]
+
+def _time(match) -> Tuple[Optional[str], Optional[Time]]:
+    if match is None:
+        return TIME_FORMAT, None
+    
+    hours, minutes, seconds, fraction = match.groups()
+    seconds = int(seconds)
+    if minutes is None:
+        minutes, seconds = divmod(seconds, 60)
+    else:
+        minutes = int(minutes)
+        if seconds >= 60 or (hours is not None and minutes >= 60):
+            return TIME_RANGE, None
+    
+    minutes += int(hours or 0) * 60
+    milliseconds = int(fraction[:3].ljust(3, '0')) if fraction else 0
+    if not (minutes or seconds or milliseconds):
+        return TIME_ZERO, None
+    return None, (minutes, seconds, milliseconds)
+
+def parse_times(times: Sequence[str]) -> Tuple[List[Optional[str]], List[Optional[Time]]]:
+    match = TIME_RE.fullmatch
+    results = [_time(match(t.strip())) for t in times]
+    return [code for code, _ in results], [parsed for _, parsed in results]
+
+def validate_columns(players: Sequence[str], maps: Sequence[str], times: Sequence[str], variables: Sequence[str],
+                     videos: Sequence[str], levels: Container, options: Container, categories: Optional[Sequence[str]] = None,
+                     known_categories: Optional[Container] = None) -> Tuple[List[Optional[str]], List[Optional[Time]]]:
+    has_player = PLAYER_RE.search
+    video = VIDEO_RE.fullmatch
+    player_codes = [None if has_player(p) else PLAYERS for p in players]
+    if categories is not None and known_categories is not None:
+        player_codes = [p or (None if c in known_categories else CATEGORY) for p, c in zip(player_codes, categories)]
+    map_codes = [None if m in levels else MAP for m in maps]
+    time_codes, parsed = parse_times(times)
+    variable_codes = [None if v in options else VARIABLE for v in variables]
+    video_codes = [None if video(v) else VIDEO for v in videos]
+    
+    codes = [p or m or t or v or u for p, m, t, v, u in zip(player_codes, map_codes, time_codes, variable_codes, video_codes)]
+    return codes, parsed
+
+def validate_rows(rows: Sequence[Dict[str, str]], levels: Container, options: Container,
+                  categories: Optional[Container] = None) -> Tuple[List[Optional[str]], List[Optional[Time]]]:
+    columns = [[row.get(key) or '' for row in rows] for key in ('players', 'map', 'time', 'variable', 'video', 'category')]
+    return validate_columns(*columns[:5], levels, options, columns[5], categories)
+
+def error_message(code: str, row: Dict[str, str]) -> str:
+    return MESSAGES[code].format_map({'category': '', 'map': '', 'time': '', 'variable': '', 'video': '', **row})
@@ -0,0 +1,212 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from src.telemetry import Telemetry
+
+# http.client (and ssl behind it) is only needed once a check starts, not for the window to open
+if TYPE_CHECKING:
+    from http.client import HTTPConnection
+
+WORKERS = 16
+PER_HOST = 4
+TIMEOUT = 10.0
+CACHE_TTL = 3600
+MAX_REDIRECTS = 3
+MAX_BODY = 64 * 1024
+
+OK = 'ok'
+DEAD = 'dead'
+PRIVATE = 'private'
+UNREACHABLE = 'unreachable'
+
+MESSAGES = {
+    DEAD: "Video not found",
+    PRIVATE: "Video is private or unlisted",
+    UNREACHABLE: "Video host unreachable",
+}
+
+# youtube answers 200 for the watch page of a deleted or private video, its oembed endpoint doesn't
+OEMBED = {
+    'youtube.com': "https://www.youtube.com/oembed",
+    'youtu.be': "https://www.youtube.com/oembed",
+}
+
+Host = Tuple[str, str, int]
+
+def _host(url: str) -> Tuple[Host, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    port = parts.port or (443 if scheme == 'https' else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    return (scheme, parts.hostname or '', port), path
+
+def _oembed(url: str) -> Optional[str]:
+    host = (urlsplit(url).hostname or '').lower()
+    for domain, endpoint in OEMBED.items():
+        if host == domain or host.endswith('.' + domain):
+            return f"{endpoint}?{urlencode({'url': url, 'format': 'json'})}"
+    return None
+
+def _classify(status: int) -> str:
+    if status < 300:
+        return OK
+    if status in (401, 403):
+        return PRIVATE
+    if status in (400, 404, 410):
+        return DEAD
+    return UNREACHABLE
+
+class ConnectionPool:
+    def __init__(self, per_host: int = PER_HOST, timeout: float = TIMEOUT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.idle = {}
+        self.slots = {}
+        self.lock = threading.Lock()
+    
+    def _slot(self, host: Host) -> threading.Semaphore:
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = threading.Semaphore(self.per_host)
+            return self.slots[host]
+    
+    def _take(self, host: Host) -> Tuple['HTTPConnection', bool]:
+        from http.client import HTTPConnection, HTTPSConnection
+        
+        with self.lock:
+            idle = self.idle.get(host)
+            if idle:
+                return idle.pop(), True
+        scheme, name, port = host
+        cls = HTTPSConnection if scheme == 'https' else HTTPConnection
+        return cls(name, port, timeout=self.timeout), False
+    
+    def _give(self, host: Host, conn: 'HTTPConnection'):
+        with self.lock:
+            self.idle.setdefault(host, []).append(conn)
+    
+    def request(self, method: str, url: str) -> Tuple[int, Optional[str]]:
+        from http.client import HTTPException
+        
+        host, path = _host(url)
+        with self._slot(host):
+            while True:
+                conn, reused = self._take(host)
+                try:
+                    conn.request(method, path, headers={'User-Agent': "Scribble", 'Connection': "keep-alive"})
+                    response = conn.getresponse()
+                    # bodies are only read to keep the connection usable, a large one isn't worth it
+                    length = response.getheader('Content-Length')
+                    if method == 'HEAD' or (length is not None and int(length) <= MAX_BODY):
+                        response.read()
+                        keep = not response.will_close
+                    else:
+                        keep = False
+                except (OSError, HTTPException, ValueError):
+                    conn.close()
+                    if reused:
+                        # the server dropped an idle keep-alive connection, try once more on a fresh one
+                        continue
+                    raise
+                
+                if keep:
+                    self._give(host, conn)
+                else:
+                    conn.close()
+                return response.status, response.getheader('Location')
+    
+    def close(self):
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+class VideoChecker:
+    def __init__(self, workers: int = WORKERS, per_host: int = PER_HOST, timeout: float = TIMEOUT,
+                 ttl: float = CACHE_TTL, telemetry: Optional[Telemetry] = None):
+        self.pool = ConnectionPool(per_host, timeout)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.ttl = ttl
+        self.results = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.telemetry = telemetry or Telemetry()
+    
+    def check(self, url: str) -> Future:
+        with self.lock:
+            cached = self.results.get(url)
+            if cached and time.monotonic() - cached[1] < self.ttl:
+                self.telemetry.inc('video_cache_hits_total')
+                future = Future()
+                future.set_result(cached[0])
+                return future
+            # the same vod is often shared by every pov of a run, so concurrent checks share one request
+            if url not in self.pending:
+                self.pending[url] = self.executor.submit(self._check, url)
+            return self.pending[url]
+    
+    def check_all(self, urls: Iterable[str]) -> Future:
+        futures = {url: self.check(url) for url in dict.fromkeys(urls)}
+        combined = Future()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+        
+        def outcome(future: Future) -> str:
+            # a cancelled check (the checker closed) or a crashed one says nothing about the video
+            if future.cancelled() or future.exception() is not None:
+                return UNREACHABLE
+            return future.result()
+        
+        # resolved by callbacks, so waiting on a whole queue never ties up a worker thread
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            combined.set_result({url: outcome(future) for url, future in futures.items()})
+        
+        if not futures:
+            combined.set_result({})
+        for future in futures.values():
+            future.add_done_callback(done)
+        return combined
+    
+    def _check(self, url: str) -> str:
+        with self.telemetry.timer('video_check_seconds'):
+            try:
+                result = self._status(url)
+            except Exception:
+                result = UNREACHABLE
+        self.telemetry.inc('video_checks_total', result=result)
+        
+        with self.lock:
+            self.pending.pop(url, None)
+            # a host being down says nothing about the video, so it's checked again next time
+            if result != UNREACHABLE:
+                self.results[url] = (result, time.monotonic())
+        return result
+    
+    def _status(self, url: str) -> str:
+        oembed = _oembed(url)
+        if oembed:
+            return _classify(self.pool.request('GET', oembed)[0])
+        
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = self.pool.request('HEAD', url)
+            if status in (405, 501):
+                status, location = self.pool.request('GET', url)
+            if 300 <= status < 400 and location:
+                url = urljoin(url, location)
+                continue
+            return _classify(status)
+        return UNREACHABLE
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
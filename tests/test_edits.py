@@ -0,0 +1,103 @@
+from types import MethodType, SimpleNamespace
+
+import pytest
+
+from bench.server import game_data
+from src.cache import game_maps
+from src.dedupe import fingerprint
+from src.edits import EditLog, build_edit, find_replace, set_field
+from src.games import Game
+from src.importer import check_lines
+
+LINES = [
+    "alice | Map 1 | 1:00.000 | Gear | https://youtu.be/a",
+    "bob | Map 2 | 2:00.000 | Gear | https://youtu.be/b",
+]
+
+@pytest.fixture
+def game(tmp_path, monkeypatch) -> Game:
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path))
+    monkeypatch.delenv('LOCALAPPDATA', raising=False)
+    return Game("bench", game_maps(game_data("bench")))
+
+@pytest.fixture
+def runs(game):
+    return [run for run, _ in check_lines(LINES, game)]
+
+def test_build_edit_revalidates(game, runs):
+    edit, errors = build_edit("map", runs, set_field('map', "Map 40"), lambda _: game, set())
+    assert not errors and len(edit.changes) == 2
+    
+    edit, errors = build_edit("map", runs, set_field('map', "Nowhere"), lambda _: game, set())
+    assert edit is None and len(errors) == 2
+
+def test_build_edit_rejects_duplicates(game, runs):
+    queued = {fingerprint(run) for run in runs}
+    edit, errors = build_edit("players", runs[1:], find_replace("bob", "alice"), lambda _: game, queued)
+    assert edit is not None and not errors
+    edit, errors = build_edit("copy", runs[1:], lambda d: {**d, 'players': "alice", 'map': "Map 1", 'time': "1:00.000"},
+                              lambda _: game, queued)
+    assert edit is None and errors[0][1] == "Would duplicate another queued run"
+    
+    # both runs collapsing onto the same values is caught within one edit too
+    edit, errors = build_edit("all", runs, lambda d: {**d, 'players': "carol", 'map': "Map 3", 'time': "3:00"},
+                              lambda _: game, queued)
+    assert len(edit.changes) == 1 and len(errors) == 1
+
+def test_edit_log_undo_redo(game, runs):
+    log = EditLog(limit=2)
+    for name in ("Map 3", "Map 4", "Map 5"):
+        edit, _ = build_edit(name, runs[:1], set_field('map', name), lambda _: game, set())
+        log.push(edit)
+    assert runs[0].level == "Map 5" and len(log.done) == 2
+    
+    log.undo()
+    assert runs[0].level == "Map 4" and log.can_redo
+    log.redo()
+    assert runs[0].level == "Map 5"
+    log.undo()
+    log.undo()
+    assert runs[0].level == "Map 3" and not log.can_undo and log.undo() is None
+
+def _window(game, runs):
+    from src import ui
+    
+    window = SimpleNamespace(
+        game=game,
+        runs_list=list(runs),
+        queued={fingerprint(run) for run in runs},
+        edits=EditLog(),
+        submitter=SimpleNamespace(running=False),
+        store=SimpleNamespace(update=lambda *runs: None),
+        queue_view=SimpleNamespace(refresh_rows=lambda runs: None),
+        _game_for=lambda _: game,
+        _update_edit_buttons=lambda: None,
+    )
+    window._change_queue = MethodType(ui.Window._change_queue, window)
+    window._edit_runs = MethodType(ui.Window._edit_runs, window)
+    window._undo = MethodType(ui.Window._undo, window)
+    window._redo = MethodType(ui.Window._redo, window)
+    return window
+
+def test_window_edit_undo_wiring(game, runs, monkeypatch):
+    from src import ui
+    
+    warnings = []
+    monkeypatch.setattr(ui.messagebox, 'showwarning', lambda *args: warnings.append(args))
+    monkeypatch.setattr(ui.messagebox, 'showinfo', lambda *args: None)
+    window = _window(game, runs)
+    old = fingerprint(runs[0])
+    
+    assert window._edit_runs(runs[:1], set_field('map', "Map 9"), "Set map")
+    assert runs[0].level == "Map 9" and old not in window.queued and fingerprint(runs[0]) in window.queued
+    
+    # a run added since the edit that matches the old values blocks the undo
+    window.queued.add(old)
+    window._undo()
+    assert runs[0].level == "Map 9" and warnings
+    
+    window.queued.discard(old)
+    window._undo()
+    assert runs[0].level == "Map 1" and old in window.queued
+    window._redo()
+    assert runs[0].level == "Map 9"
@@ -0,0 +1,25 @@
+import pytest
+
+from bench.server import game_data
+from src.cache import game_maps
+from src.games import Game
+from src.importer import check_lines
+
+LINE = "alice | Map 1 | 1:00.000 | Gear | https://youtu.be/a"
+
+@pytest.fixture
+def game(tmp_path, monkeypatch) -> Game:
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path))
+    monkeypatch.delenv('LOCALAPPDATA', raising=False)
+    data = game_maps(game_data("bench"))
+    data['categories'] = {"Any%": "any", "100%": "hundred"}
+    return Game("bench", data)
+
+def test_implied_category_needs_a_default(game):
+    [(run, error)] = check_lines([LINE], game)
+    assert run is None and error.startswith("Invalid category (Solo)")
+
+def test_implied_category_falls_back_to_default(game):
+    game.default_category = "100%"
+    [(run, error)] = check_lines([LINE], game)
+    assert error is None and run.category == "100%" and run.category_id == "hundred"